@@ -1,6 +1,8 @@
 import os
+import orjson
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Optional
 
 def safe_print(msg: str):
@@ -18,16 +20,38 @@ class ZaiClient:
         self.base_url = "https://open.bigmodel.cn/api/paas/v4"
         self.model = "glm-4.7-flash" # As requested by user
 
-    def chat_completion(self, prompt: str) -> Optional[str]:
-        if not self.api_key:
-            safe_print("[Z.AI] ZAI_API_KEY not found.")
-            return None
+        self.url = f"{self.base_url.rstrip('/')}/chat/completions"
 
-        headers = {
+        # Ensure proxy is picked up
+        self.proxies = {
+            scheme: value
+            for scheme, value in (("https", os.environ.get("HTTPS_PROXY")), ("http", os.environ.get("HTTP_PROXY")))
+            if value
+        }
+
+        # One pooled session per client so the TLS connection is kept alive
+        # across the hundreds of calls made by the processor loop.
+        # Retries (with exponential backoff and Retry-After) happen inside the
+        # adapter, and only for transient failures; 4xx such as 400/401 fail fast.
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["POST"],
+            respect_retry_after_header=True,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry))
+        self.session.headers.update({
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json",
             "Accept-Language": "en-US,en"
-        }
+        })
+
+    def chat_completion(self, prompt: str) -> Optional[str]:
+        if not self.api_key:
+            safe_print("[Z.AI] ZAI_API_KEY not found.")
+            return None
 
         payload = {
             "model": self.model,
@@ -36,35 +60,19 @@ class ZaiClient:
             "stream": False
         }
 
-        # Ensure proxy is picked up
-        proxies = {}
-        if os.environ.get("HTTPS_PROXY"):
-            proxies["https"] = os.environ.get("HTTPS_PROXY")
-        if os.environ.get("HTTP_PROXY"):
-            proxies["http"] = os.environ.get("HTTP_PROXY")
-
         try:
-            # Retry logic
-            for attempt in range(3):
-                try:
-                    url = f"{self.base_url.rstrip('/')}/chat/completions"
-                    response = requests.post(
-                        url,
-                        headers=headers,
-                        json=payload,
-                        proxies=proxies,
-                        timeout=60
-                    )
-                    response.raise_for_status()
-                    data = response.json()
-                    return data['choices'][0]['message']['content']
-                except requests.exceptions.RequestException as e:
-                    safe_print(f"[Z.AI] Attempt {attempt+1} failed: {e}")
-                    if attempt < 2:
-                        time.sleep(2)
-                    else:
-                        safe_print("[Z.AI] All retries failed.")
-                        return None
+            response = self.session.post(
+                self.url,
+                data=orjson.dumps(payload),
+                proxies=self.proxies,
+                timeout=60
+            )
+            response.raise_for_status()
+            data = orjson.loads(response.content)
+            return data['choices'][0]['message']['content']
+        except requests.exceptions.RequestException as e:
+            safe_print(f"[Z.AI] Request failed: {e}")
+            return None
         except Exception as e:
             safe_print(f"[Z.AI] Unexpected error: {e}")
             return None
@@ -4,8 +4,9 @@ Unified CBDC Scraping Pipeline Runner
 """
 
 import argparse
+import asyncio
+import codecs
 import os
-import subprocess
 import sys
 import time
 from datetime import datetime
@@ -16,7 +17,8 @@ from typing import List
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from src.utils import GLOBAL_NEW_CSV, STANDARD_FIELDS, load_dotenv
+from src.utils import GLOBAL_NEW_CSV, STANDARD_FIELDS, env_int, load_dotenv
+from src.scrapers.run_all import ASYNC_SCRAPERS
 
 load_dotenv()
 
@@ -42,71 +44,72 @@ JOBS = [
 ]
 
 DATA_DIR = ROOT / "data"
+# Must match OUTPUT_DOC_DIR in src/pipeline/post_process.py
+REPORTS_DIR = DATA_DIR / "reports"
+
+# How many scraper subprocesses run at once (sync Playwright ones launch their own Chromium)
+JOB_CONCURRENCY = env_int("CBDC_JOB_CONCURRENCY", 4)
 
 def init_global_new_csv():
     """Initialize (clear) the global new CSV file with header."""
     print(f"🧹 Initializing {GLOBAL_NEW_CSV}...")
-    import csv
-    with GLOBAL_NEW_CSV.open("w", encoding="utf-8-sig", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=list(STANDARD_FIELDS), quoting=csv.QUOTE_ALL, extrasaction="ignore")
-        writer.writeheader()
+    # Same bytes csv.DictWriter(QUOTE_ALL) + utf-8-sig would produce: BOM, quoted header, CRLF
+    header = ",".join(f'"{field}"' for field in STANDARD_FIELDS) + "\r\n"
+    GLOBAL_NEW_CSV.write_bytes(codecs.BOM_UTF8 + header.encode("utf-8"))
 
-def run_job(job_name: str):
+async def run_job(job_name: str, sem: asyncio.Semaphore, *args: str):
     """Run a scraper module as a subprocess."""
-    print(f"\n{'='*40}")
-    print(f"🚀 Running Job: {job_name}")
-    print(f"{'='*40}")
-    
-    start_time = time.time()
-    try:
-        # Run using python -m src.scrapers.<job_name>
-        # This ensures imports work correctly relative to root
-        cmd = [sys.executable, "-m", f"src.scrapers.{job_name}"]
-        result = subprocess.run(cmd, cwd=ROOT, capture_output=False)
+    async with sem:
+        print(f"\n{'='*40}")
+        print(f"🚀 Running Job: {' '.join((job_name,) + args)}")
+        print(f"{'='*40}")
         
-        duration = time.time() - start_time
-        if result.returncode == 0:
-            print(f"✅ Job '{job_name}' completed in {duration:.2f}s")
-        else:
-            print(f"❌ Job '{job_name}' failed with code {result.returncode} in {duration:.2f}s")
-    except Exception as e:
-        print(f"❌ Job '{job_name}' error: {e}")
+        start_time = time.time()
+        try:
+            # Run using python -m src.scrapers.<job_name>
+            # This ensures imports work correctly relative to root
+            proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", f"src.scrapers.{job_name}", *args, cwd=ROOT
+            )
+            returncode = await proc.wait()
+            
+            duration = time.time() - start_time
+            if returncode == 0:
+                print(f"✅ Job '{job_name}' completed in {duration:.2f}s")
+            else:
+                print(f"❌ Job '{job_name}' failed with code {returncode} in {duration:.2f}s")
+        except Exception as e:
+            print(f"❌ Job '{job_name}' error: {e}")
+
+async def run_jobs(selected_jobs: List[str]):
+    """Run the scraper jobs concurrently, at most JOB_CONCURRENCY at a time."""
+    sem = asyncio.Semaphore(max(JOB_CONCURRENCY, 1))
+    # Async Playwright scrapers share one Chromium inside a single run_all process
+    shared = [job for job in selected_jobs if job in ASYNC_SCRAPERS]
+    tasks = [run_job(job, sem) for job in selected_jobs if job not in ASYNC_SCRAPERS]
+    if shared:
+        tasks.append(run_job("run_all", sem, *shared))
+    await asyncio.gather(*tasks)
 
 def run_pipeline(selected_jobs: List[str]):
     """Execute the full scraping and processing pipeline."""
     print(f"[{datetime.now()}] 🕒 Starting Scheduled Pipeline...")
     
-    # --- Check for existing report (Idempotency) ---
+    # --- Check for today's completion sentinel (Idempotency) ---
+    # A single stat; nothing from src.processor is imported on this path
     today_str = datetime.now().strftime('%Y%m%d')
-    report_filename = f"数字货币国际资讯日报_{today_str}.docx" # Using Chinese name as per typical output, or English?
-    # Wait, processor.py usually names it. Let's check processor.py code to be sure about the name.
-    # But I can't read it again without cost. I'll make a safe guess or check if I can import a constant.
-    # Actually, let's just use the logic: check if ANY file in reports dir contains today's date?
-    # Or better, look at processor code if possible. 
-    # I remember seeing "OUTPUT_DOC_DIR" in processor.py.
+    done_marker = REPORTS_DIR / f".done_{today_str}"
     
-    # Let's try to import OUTPUT_DOC_DIR from src.processor
-    try:
-        from src.processor import OUTPUT_DOC_DIR
-        report_path = OUTPUT_DOC_DIR / f"数字货币国际资讯日报_{today_str}.docx"
-        
-        # Check for English name just in case
-        report_path_en = OUTPUT_DOC_DIR / f"CBDC_Report_{today_str}.docx"
-        
-        if report_path.exists() or report_path_en.exists():
-             print(f"⏭️ Report for today ({today_str}) already exists. Skipping execution.")
-             return
-    except ImportError:
-        # Fallback if import fails (unlikely)
-        pass
+    if done_marker.exists():
+         print(f"⏭️ Report for today ({today_str}) already exists. Skipping execution.")
+         return
 
     # Always initialize global new CSV before running jobs
     if selected_jobs:
         init_global_new_csv()
         
     print(f"Selected Jobs: {', '.join(selected_jobs)}")
-    for job in selected_jobs:
-        run_job(job)
+    asyncio.run(run_jobs(selected_jobs))
 
     # --- Run Processor (Analysis, Report, Email) ---
     try:
@@ -114,7 +117,9 @@ def run_pipeline(selected_jobs: List[str]):
         print("\n" + "="*40)
         print("🧠 Running AI Processor & Reporting")
         print("="*40)
-        run_processor()
+        if run_processor():
+            REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+            done_marker.touch()
     except Exception as e:
         print(f"❌ Processor failed: {e}")
         
@@ -1,20 +1,23 @@
 # -*- coding: utf-8 -*-
+import base64
+import io
 import os
 import smtplib
 from datetime import datetime
+from email import encoders
 from email.header import Header
 from email.mime.application import MIMEApplication
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
+from functools import lru_cache
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 
-from docx import Document
-from docx.shared import Pt
-from docx.oxml.ns import qn
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from src.utils import to_chinese_numeral
 
+# python-docx is imported inside the functions that use it, so importing this
+# module (e.g. for the email helpers) doesn't pay for it.
+
 # Configuration for Email
 EMAIL_HOST = "smtp.qq.com"
 EMAIL_PORT = 465
@@ -28,31 +31,38 @@ TEMPLATE_PATH = ROOT_DIR / "memo" / "模板.docx"
 OUTPUT_DOC_DIR = DATA_DIR / "reports"
 OUTPUT_DOC_DIR.mkdir(exist_ok=True, parents=True)
 
+# Paragraph markers every usable template must contain
+TEMPLATE_MARKERS = [
+    "新疆维吾尔自治区分行",
+    "编译："
+]
+
+@lru_cache(maxsize=None)
+def _template_bytes(docx_path: str) -> bytes:
+    """Read a template from disk once per process."""
+    return Path(docx_path).read_bytes()
+
 def inspect_template_paragraphs(docx_path: str) -> List[str]:
     """Return a list of text from all paragraphs in the document."""
     try:
-        doc = Document(docx_path)
+        from docx import Document
+        doc = Document(io.BytesIO(_template_bytes(str(docx_path))))
         return [p.text for p in doc.paragraphs]
     except Exception as e:
         print(f"Error reading docx: {e}")
         return []
 
+def find_missing_markers(paragraphs: List[str]) -> List[str]:
+    # Markers contain no newline, so they cannot match across paragraph boundaries
+    joined = "\n".join(paragraphs)
+    return [marker for marker in TEMPLATE_MARKERS if marker not in joined]
+
 def validate_template_integrity(docx_path: str) -> Tuple[bool, str]:
     path = Path(docx_path)
     if not path.exists():
         return False, f"Template file not found: {docx_path}"
 
-    paragraphs = inspect_template_paragraphs(str(path))
-    
-    required_markers = [
-        "新疆维吾尔自治区分行",
-        "编译："
-    ]
-    
-    missing = []
-    for marker in required_markers:
-        if not any(marker in p_text for p_text in paragraphs):
-            missing.append(marker)
+    missing = find_missing_markers(inspect_template_paragraphs(str(path)))
             
     if missing:
         return False, f"Missing critical markers in template: {missing}"
@@ -60,6 +70,8 @@ def validate_template_integrity(docx_path: str) -> Tuple[bool, str]:
     return True, "Template is valid."
 
 def set_run_font(run, font_name, size_pt, bold=False):
+    from docx.oxml.ns import qn
+    from docx.shared import Pt
     run.font.name = font_name
     run.font.size = Pt(size_pt)
     run.font.bold = bold
@@ -84,11 +96,15 @@ def generate_word_report(articles: List[Dict], date_str: str, filename_prefix: s
     # If valid_articles is empty, let's generate a "No Content" report to be safe, 
     # so the user sees an attachment confirming "Nothing today".
     
-    is_valid, val_msg = validate_template_integrity(str(TEMPLATE_PATH))
-    if not is_valid:
-        raise ValueError(f"Template validation failed: {val_msg}")
+    if not TEMPLATE_PATH.exists():
+        raise ValueError(f"Template validation failed: Template file not found: {TEMPLATE_PATH}")
     
-    doc = Document(TEMPLATE_PATH)
+    from docx import Document
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+    from docx.shared import Pt
+
+    # Fresh Document per report, built from the cached template bytes
+    doc = Document(io.BytesIO(_template_bytes(str(TEMPLATE_PATH))))
     
     def format_paragraph_text(paragraph, text, font_name, size_pt, bold=False, align=None):
         paragraph.clear()
@@ -101,44 +117,51 @@ def generate_word_report(articles: List[Dict], date_str: str, filename_prefix: s
     target_font_fs = "FangSong_GB2312"
     target_font_hei = "SimHei"
     
-    # 1. Set Date
-    for p in doc.paragraphs:
-        if "2026年" in p.text and "月" in p.text:
-            dt = datetime.now()
-            parts = p.text.split("2026年")
-            prefix = parts[0] if parts else "新疆维吾尔自治区分行········································"
-            new_date_str = f"{dt.year}年{dt.month}月{dt.day}日"
-            full_text = prefix + new_date_str
-            format_paragraph_text(p, full_text, target_font_fs, 16)
-            break
-            
-    # 2. Identify Sections
+    # Single pass over the template paragraphs (doc.paragraphs rebuilds its list on every access)
+    paragraphs = list(doc.paragraphs)
+    date_p = None
     date_idx = -1
     footer_idx = -1
+    reviewer_ps = []
+    texts = []
     
-    for i, p in enumerate(doc.paragraphs):
-        if "新疆维吾尔自治区分行" in p.text:
-            date_idx = i
-        elif "编译：" in p.text:
-            footer_idx = i
-            break
+    for i, p in enumerate(paragraphs):
+        text = p.text
+        texts.append(text)
+        if date_p is None and "2026年" in text and "月" in text:
+            date_p = p
+        if footer_idx == -1:
+            if "新疆维吾尔自治区分行" in text:
+                date_idx = i
+            elif "编译：" in text:
+                footer_idx = i
+        if "编审：" in text:
+            reviewer_ps.append(p)
+
+    # Template validation, done on the document being edited
+    missing = find_missing_markers(texts)
+    if missing:
+        raise ValueError(f"Template validation failed: Missing critical markers in template: {missing}")
+
+    # 1. Set Date
+    if date_p is not None:
+        dt = datetime.now()
+        parts = date_p.text.split("2026年")
+        prefix = parts[0] if parts else "新疆维吾尔自治区分行········································"
+        new_date_str = f"{dt.year}年{dt.month}月{dt.day}日"
+        full_text = prefix + new_date_str
+        format_paragraph_text(date_p, full_text, target_font_fs, 16)
             
+    # 2. Identify Sections
     if date_idx != -1 and footer_idx != -1 and footer_idx > date_idx:
         # Clear content
-        to_remove = []
-        for i in range(date_idx + 1, footer_idx):
-            to_remove.append(doc.paragraphs[i])
-        for p in to_remove:
+        for p in paragraphs[date_idx + 1:footer_idx]:
             p.clear()
             if p._element.getparent() is not None:
                 p._element.getparent().remove(p._element)
 
-        # Find footer again
-        ref_p = None
-        for p in doc.paragraphs:
-            if "编译：" in p.text:
-                ref_p = p
-                break
+        # Footer paragraph object is unaffected by the removal above
+        ref_p = paragraphs[footer_idx]
         
         if ref_p:
             if not valid_articles:
@@ -191,19 +214,35 @@ def generate_word_report(articles: List[Dict], date_str: str, filename_prefix: s
 
             if "编译：" in ref_p.text:
                 format_paragraph_text(ref_p, ref_p.text, target_font_fs, 16)
-            for p in doc.paragraphs:
-                if "编审：" in p.text:
-                    format_paragraph_text(p, p.text, target_font_fs, 16)
+            for p in reviewer_ps:
+                format_paragraph_text(p, p.text, target_font_fs, 16)
     
     filename = f"{filename_prefix}_{datetime.now().strftime('%Y%m%d')}.docx"
     out_path = OUTPUT_DOC_DIR / filename
     doc.save(out_path)
     return out_path
 
-def send_email_with_attachment(filepaths: List[Path], csv_content_html: str = "", stats: Dict = None):
+def build_attachment_part(fp: Path) -> MIMEApplication:
+    """
+    Base64 attachment built from the file in chunks, so the raw bytes and the
+    encoded copy are never both held in memory in full.
+    """
+    # 57 raw bytes encode to exactly one 76-char base64 line, so chunk outputs concatenate cleanly
+    chunk_size = 57 * 1024
+    encoded = []
+    with open(fp, 'rb') as f:
+        while chunk := f.read(chunk_size):
+            encoded.append(base64.encodebytes(chunk).decode('ascii'))
+    part = MIMEApplication(b"", Name=fp.name, _encoder=encoders.encode_noop)
+    part.set_payload("".join(encoded))
+    part['Content-Transfer-Encoding'] = 'base64'
+    return part
+
+def send_email_with_attachment(filepaths: List[Path], csv_content_html: str = "", stats: Dict = None) -> bool:
+    """Email the reports; returns True only if the message was sent."""
     if not all([EMAIL_USER, EMAIL_PASS, EMAIL_TO]):
         print("⚠️ Email credentials missing. Skipping email.")
-        return
+        return False
 
     msg = MIMEMultipart()
     msg['From'] = EMAIL_USER
@@ -233,10 +272,9 @@ def send_email_with_attachment(filepaths: List[Path], csv_content_html: str = ""
     # Attach all files
     for fp in filepaths:
         if fp and fp.exists():
-            with open(fp, 'rb') as f:
-                part = MIMEApplication(f.read(), Name=fp.name)
-                part['Content-Disposition'] = f'attachment; filename="{fp.name}"'
-                msg.attach(part)
+            part = build_attachment_part(fp)
+            part['Content-Disposition'] = f'attachment; filename="{fp.name}"'
+            msg.attach(part)
         
     try:
         server = smtplib.SMTP_SSL(EMAIL_HOST, EMAIL_PORT)
@@ -244,5 +282,7 @@ def send_email_with_attachment(filepaths: List[Path], csv_content_html: str = ""
         server.sendmail(EMAIL_USER, EMAIL_TO, msg.as_string())
         server.quit()
         print(f"✅ Email sent successfully to {EMAIL_TO}")
+        return True
     except Exception as e:
         print(f"❌ Email failed: {e}")
+        return False
@@ -1,6 +1,5 @@
 # -*- coding: utf-8 -*-
-import pandas as pd
-import time
+import asyncio
 import sys
 import argparse
 from pathlib import Path
@@ -11,13 +10,83 @@ ROOT_DIR = Path(__file__).resolve().parents[1]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
-from src.utils import GLOBAL_NEW_CSV, GLOBAL_ALL_CSV, load_dotenv
+from src.utils import GLOBAL_NEW_CSV, GLOBAL_ALL_CSV, env_int, load_dotenv
 from src.services.relevance_service import RelevanceService
 from src.pipeline.post_process import generate_word_report, send_email_with_attachment
 
 load_dotenv()
 
+# Per-model status columns written back to the input file and the global history
+STATUS_COLUMNS = ['is_relevant', 'zai_is_relevant', 'zai_reason', 'or_is_relevant', 'or_reason']
+
+# Number of articles analysed concurrently (each one fans out to both providers)
+AI_CONCURRENCY = env_int("CBDC_AI_CONCURRENCY", 4)
+
+async def _assess_all(service, rows):
+    """Run assess_relevance for every (title, abstract, content) with bounded concurrency."""
+    sem = asyncio.Semaphore(max(AI_CONCURRENCY, 1))
+
+    async def _one(title, abstract, content):
+        async with sem:
+            print(f"  Processing: {title[:50]}...")
+            try:
+                return await service.assess_relevance_async(title, abstract, content)
+            except Exception as e:
+                print(f"  ❌ Service Error: {e}")
+                return {
+                    "is_relevant": "ERROR",
+                    "reasoning": f"Exception: {str(e)}",
+                    "confidence": 0.0,
+                    "details": {},
+                    "alert_needed": True
+                }
+
+    return await asyncio.gather(*(_one(*r) for r in rows))
+
+def update_global_history(df):
+    """Write this run's status columns back into GLOBAL_ALL_CSV, matched by uid."""
+    import pandas as pd
+    try:
+        # Text-only file: skip dtype inference (it would also turn TRUE/FALSE into bools)
+        df_all = pd.read_csv(GLOBAL_ALL_CSV, dtype=str, memory_map=True)
+        # Ensure new columns exist in global history
+        for col in STATUS_COLUMNS:
+            if col not in df_all.columns:
+                df_all[col] = ""
+        
+        if 'uid' in df.columns and 'uid' in df_all.columns:
+            # Single keyed update for all status columns (last row wins per uid)
+            all_columns = list(df_all.columns)
+            updates = df.drop_duplicates('uid', keep='last').set_index('uid')[STATUS_COLUMNS]
+            # As text, like the history columns (str dtype rejects bools); empty cells stay
+            # missing, so update() leaves those history values alone
+            updates = updates.astype(str).where(updates.notna())
+            df_all = df_all.set_index('uid')
+            df_all.update(updates)
+            df_all = df_all.reset_index()[all_columns]
+            
+            df_all.to_csv(GLOBAL_ALL_CSV, index=False, encoding='utf-8-sig')
+            print("💾 Updated GLOBAL_standard_all.csv with detailed status.")
+    except Exception as e:
+         print(f"⚠️ Failed to update GLOBAL_ALL_CSV: {e}")
+
+async def _notify_and_write_back(df, update_history, attachments, html_table, stats):
+    """Send the email on a worker thread while the history CSV write-back runs; True if it was sent."""
+    jobs = [asyncio.to_thread(send_email_with_attachment, attachments, csv_content_html=html_table, stats=stats)]
+    if update_history:
+        jobs.append(asyncio.to_thread(update_global_history, df))
+    results = await asyncio.gather(*jobs)
+    return results[0]
+
 def main(input_path=None, output_path=None):
+    """Analyse, report and email the new articles.
+
+    Returns True only if at least one report was generated and the email was sent;
+    otherwise the caller leaves today's run open for a retry.
+    """
+    # Imported here so `src.main` can import this module without paying for pandas
+    import pandas as pd
+
     print("🚀 Starting CBDC News Processor (Dual-Path)...")
     
     # 1. Load Data
@@ -37,7 +106,7 @@ def main(input_path=None, output_path=None):
             df = pd.read_csv(input_file)
             
         # Initialize columns
-        for col in ['is_relevant', 'zai_is_relevant', 'zai_reason', 'or_is_relevant', 'or_reason']:
+        for col in STATUS_COLUMNS:
             if col not in df.columns:
                 df[col] = ""
     except Exception as e:
@@ -58,29 +127,21 @@ def main(input_path=None, output_path=None):
     alert_details = []
     
     print(f"🔍 Analyzing {len(df)} articles...")
-    
-    for index, row in df.iterrows():
-        title = str(row.get('title', ''))
-        abstract = str(row.get('abstract', ''))
-        content = str(row.get('content', ''))
-        url = str(row.get('url', ''))
-        entity = str(row.get('entity', 'Source'))
-        
-        print(f"  Processing: {title[:50]}...")
-        
-        # Call Service
-        try:
-            result = service.assess_relevance(title, abstract, content)
-        except Exception as e:
-            print(f"  ❌ Service Error: {e}")
-            result = {
-                "is_relevant": "ERROR",
-                "reasoning": f"Exception: {str(e)}",
-                "confidence": 0.0,
-                "details": {},
-                "alert_needed": True
-            }
 
+    # Column-wise extraction; missing columns fall back to their defaults
+    input_cols = {'title': '', 'abstract': '', 'content': '', 'url': '', 'entity': 'Source'}
+    rows = list(zip(*(
+        df[col].astype(str).tolist() if col in df.columns else [default] * len(df)
+        for col, default in input_cols.items()
+    )))
+
+    # Call Service (concurrently, results come back in row order)
+    results = asyncio.run(_assess_all(service, [(t, a, c) for t, a, c, _, _ in rows]))
+
+    # Output columns, assigned once after the loop
+    is_relevant_col, zai_ir_col, zai_reason_col, or_ir_col, or_reason_col = [], [], [], [], []
+
+    for (title, abstract, content, url, entity), result in zip(rows, results):
         # Enrich result with metadata for reporting
         result['url'] = url
         result['entity'] = entity
@@ -111,21 +172,21 @@ def main(input_path=None, output_path=None):
         
         # Update DataFrame
         if is_rel is True:
-            df.at[index, 'is_relevant'] = "TRUE"
+            is_relevant_col.append("TRUE")
             print(f"    ✅ RELEVANT ({confidence})")
             relevant_articles.append(result)
         elif is_rel == "ERROR":
-            df.at[index, 'is_relevant'] = "ERROR"
+            is_relevant_col.append("ERROR")
             print(f"    ⚠️ ERROR: {reason}")
         else:
-            df.at[index, 'is_relevant'] = "FALSE"
+            is_relevant_col.append("FALSE")
             print(f"    x Irrelevant")
         
         # Record detailed columns
-        df.at[index, 'zai_is_relevant'] = str(zai_det.get('is_relevant'))
-        df.at[index, 'zai_reason'] = str(zai_det.get('reason', ''))
-        df.at[index, 'or_is_relevant'] = str(or_det.get('is_relevant'))
-        df.at[index, 'or_reason'] = str(or_det.get('reason', ''))
+        zai_ir_col.append(str(zai_det.get('is_relevant')))
+        zai_reason_col.append(str(zai_det.get('reason', '')))
+        or_ir_col.append(str(or_det.get('is_relevant')))
+        or_reason_col.append(str(or_det.get('reason', '')))
 
         # Add to summary list
         processing_results.append({
@@ -137,8 +198,12 @@ def main(input_path=None, output_path=None):
             "zai_status": zai_det.get('status'),
             "or_status": or_det.get('status')
         })
-        
-        time.sleep(1) # Rate limit politeness
+
+    df['is_relevant'] = is_relevant_col
+    df['zai_is_relevant'] = zai_ir_col
+    df['zai_reason'] = zai_reason_col
+    df['or_is_relevant'] = or_ir_col
+    df['or_reason'] = or_reason_col
 
     # 3. Save Updated CSV/JSON
     try:
@@ -151,28 +216,8 @@ def main(input_path=None, output_path=None):
     except Exception as e:
         print(f"⚠️ Failed to update file: {e}")
 
-    # 4. Update Global History CSV
-    if not input_path and GLOBAL_ALL_CSV.exists():
-        try:
-            df_all = pd.read_csv(GLOBAL_ALL_CSV)
-            # Ensure new columns exist in global history
-            for col in ['is_relevant', 'zai_is_relevant', 'zai_reason', 'or_is_relevant', 'or_reason']:
-                if col not in df_all.columns:
-                    df_all[col] = ""
-            
-            if 'uid' in df.columns and 'uid' in df_all.columns:
-                # Update map for all columns
-                for col in ['is_relevant', 'zai_is_relevant', 'zai_reason', 'or_is_relevant', 'or_reason']:
-                    status_map = dict(zip(df['uid'], df[col]))
-                    df_all[col] = df_all['uid'].map(status_map).fillna(df_all[col])
-                
-                df_all.to_csv(GLOBAL_ALL_CSV, index=False, encoding='utf-8-sig')
-                print("💾 Updated GLOBAL_standard_all.csv with detailed status.")
-        except Exception as e:
-             print(f"⚠️ Failed to update GLOBAL_ALL_CSV: {e}")
-
-    # 5. Generate Email HTML
-    html_table = """
+    # 4. Generate Email HTML (fragments joined once at the end)
+    html_parts = ["""
     <table border="1" style="border-collapse: collapse; width: 100%; font-size: 12px;">
         <thead>
             <tr style="background-color: #f2f2f2;">
@@ -184,7 +229,7 @@ def main(input_path=None, output_path=None):
             </tr>
         </thead>
         <tbody>
-    """
+    """]
     
     for i, res in enumerate(processing_results):
         status = res['is_relevant']
@@ -198,7 +243,7 @@ def main(input_path=None, output_path=None):
             color = "gray"
             text = "Irrelevant"
             
-        html_table += f"""
+        html_parts.append(f"""
             <tr>
                 <td>{i+1}</td>
                 <td><a href="{res['url']}">{res['title']}</a></td>
@@ -206,10 +251,11 @@ def main(input_path=None, output_path=None):
                 <td>{res.get('zai_status')}</td>
                 <td>{res.get('or_status')}</td>
             </tr>
-        """
-    html_table += "</tbody></table>"
+        """)
+    html_parts.append("</tbody></table>")
+    html_table = "".join(html_parts)
 
-    # 6. Generate Report Docs
+    # 5. Generate Report Docs
     attachments = []
     today_str = datetime.now().strftime("%Y-%m-%d")
     
@@ -231,15 +277,18 @@ def main(input_path=None, output_path=None):
     except Exception as e:
         print(f"❌ Failed to generate All News report: {e}")
 
-    # 7. Send Email (Normal or Alert)
+    # 6. Send Email (Normal or Alert)
     print("📧 Sending email...")
     
     # Stats
     total_all_count = 0
     if GLOBAL_ALL_CSV.exists():
         try:
-             with open(GLOBAL_ALL_CSV, 'r', encoding='utf-8') as f:
-                 total_all_count = sum(1 for _ in f) - 1
+             # Count newlines on raw bytes; no decoding or per-line objects
+             with open(GLOBAL_ALL_CSV, 'rb', buffering=0) as f:
+                 total_all_count = -1  # header
+                 while chunk := f.read(1 << 20):
+                     total_all_count += chunk.count(b'\n')
         except:
              pass
     
@@ -256,8 +305,18 @@ def main(input_path=None, output_path=None):
         # We can append alert details to HTML
         html_table = f"<h2>⚠️ API Critical Failure Alert</h2><pre>{chr(10).join(alert_details[:10])}</pre>" + html_table
     
-    send_email_with_attachment(attachments, csv_content_html=html_table, stats=stats)
+    # 7. Update Global History CSV, overlapped with the SMTP round trips
+    # (stats above were computed first, so the rewrite cannot skew them)
+    update_history = not input_path and GLOBAL_ALL_CSV.exists()
+    sent = asyncio.run(_notify_and_write_back(df, update_history, attachments, html_table, stats))
     print("🏁 Done.")
+    if not attachments:
+        print("⚠️ No report was generated; today's run is not marked done.")
+        return False
+    if not sent:
+        print("⚠️ Email was not sent; today's run is not marked done.")
+        return False
+    return True
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
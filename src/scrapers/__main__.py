@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+"""`python -m src.scrapers [name ...]`: run the scrapers concurrently in one process."""
+from .run_all import main
+
+if __name__ == "__main__":
+    main()
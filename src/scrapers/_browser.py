@@ -0,0 +1,238 @@
+# -*- coding: utf-8 -*-
+"""
+Shared headless Chromium for the async Playwright scrapers.
+
+Launching Chromium is the expensive part of a scraper run; a browser context
+is cheap. Every async scraper therefore opens its own context (so cookies and
+routes stay isolated) on one browser per process, launched on first use.
+
+The launch flags and resource filter below are also used by the sync
+Playwright scrapers.
+"""
+import asyncio
+import re
+import time
+from contextlib import asynccontextmanager
+
+from bs4 import BeautifulSoup, SoupStrainer
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from playwright.async_api import async_playwright
+
+from ..utils import env_int
+
+# Detail pages each scraper loads at once
+DETAIL_CONCURRENCY = env_int("CBDC_DETAIL_CONCURRENCY", 10)
+# Detail fetches each scraper starts per second; 0 = no limit
+DETAIL_RPS = env_int("CBDC_DETAIL_RPS", 0)
+
+# Text-only scrape: skip downloading these resource types
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Analytics / ad hosts (any resource type); none of them affects page text
+BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "facebook.net", "hotjar.com", "clarity.ms", "mc.yandex.ru", "matomo.cloud",
+)
+_BLOCKED_HOST_RE = re.compile(
+    r"^[a-z]+://(?:[^/?#]*\.)?(?:%s)(?::\d+)?(?:[/?#]|$)" % "|".join(map(re.escape, BLOCKED_HOSTS)), re.I
+)
+
+# Chromium switches for a text-only headless scrape: no /dev/shm (small in
+# containers), no GPU, no image decoding, no background services. Playwright
+# already launches without the sandbox unless chromium_sandbox=True.
+CHROMIUM_ARGS = [
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--blink-settings=imagesEnabled=false",
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-features=TranslateUI",
+]
+
+# How long to wait for a page's content selector before parsing what loaded (ms)
+CONTENT_WAIT_TIMEOUT = 15000
+
+_playwright = None
+_browser = None
+_lock = asyncio.Lock()
+
+async def get_browser():
+    """Return the process-wide Chromium, launching it on first call."""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+    return _browser
+
+def _is_blocked(request):
+    return request.resource_type in BLOCKED_RESOURCE_TYPES or _BLOCKED_HOST_RE.match(request.url) is not None
+
+async def block_heavy_resources(route):
+    if _is_blocked(route.request):
+        await route.abort()
+    else:
+        await route.continue_()
+
+def block_heavy_resources_sync(route):
+    """Same filter for playwright.sync_api pages and contexts."""
+    if _is_blocked(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+@asynccontextmanager
+async def shared_context(block_resources=True, **kwargs):
+    """Open a fresh context on the shared browser; closed again on exit."""
+    browser = await get_browser()
+    context = await browser.new_context(**kwargs)
+    if block_resources:
+        await context.route("**/*", block_heavy_resources)
+    try:
+        yield context
+    finally:
+        await context.close()
+
+def class_strainer(*classes, name=None):
+    """SoupStrainer that keeps only elements carrying any of `classes`, with their subtrees.
+
+    Matches the raw class attribute, so multi-class elements such as
+    class="clearfix pagina-interior" are caught too.
+    """
+    pattern = re.compile(r"(?:^|\s)(?:%s)(?:\s|$)" % "|".join(map(re.escape, classes)))
+    return SoupStrainer(name, class_=pattern)
+
+async def wait_for_content(page, selector, timeout=CONTENT_WAIT_TIMEOUT):
+    """Wait until `selector` is in the DOM. On timeout return False; the caller parses whatever loaded."""
+    try:
+        await page.wait_for_selector(selector, state="attached", timeout=timeout)
+        return True
+    except PlaywrightTimeoutError:
+        return False
+
+async def list_item_soups(page, selector):
+    """Parse only the list items matching `selector`, one soup per item.
+
+    Just their outerHTML crosses the Playwright channel instead of the whole
+    serialized page.
+    """
+    fragments = await page.eval_on_selector_all(selector, "els => els.map(e => e.outerHTML)")
+    return [BeautifulSoup(html, "lxml") for html in fragments]
+
+async def click_and_wait_for_list(page, button, item_selector, timeout=CONTENT_WAIT_TIMEOUT):
+    """Click a pager / load-more control and wait for the list to change.
+
+    Done once the first current item is gone (navigation or re-render) or more
+    items match (appended results), then once items are present again.
+    """
+    first = await page.query_selector(item_selector)
+    count = len(await page.query_selector_all(item_selector))
+    await button.click()
+    if first is not None:
+        try:
+            await page.wait_for_function(
+                "([first, sel, n]) => !first.isConnected || document.querySelectorAll(sel).length > n",
+                arg=[first, item_selector, count],
+                timeout=timeout,
+            )
+        except Exception:
+            # Timed out, or a navigation destroyed the old document (also a change)
+            pass
+    return await wait_for_content(page, item_selector, timeout)
+
+class RateLimiter:
+    """Spaces out calls to wait() at least 1/rps seconds apart; rps <= 0 never waits.
+
+    Only the start of each request is paced, so a slow response doesn't add a
+    fixed delay on top of itself.
+    """
+
+    def __init__(self, rps):
+        self._interval = 1.0 / rps if rps > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self):
+        if not self._interval:
+            return
+        now = time.monotonic()
+        # Claim the next slot before sleeping, so concurrent callers queue up behind it
+        start = max(now, self._next)
+        self._next = start + self._interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+class DetailPagePool:
+    """Up to `size` reusable pages in one context, lent out per detail fetch.
+
+    Pages are opened on demand and reused across list pages; they close with
+    the context. A page that gets closed during a fetch is dropped, and its
+    slot goes to a fresh page.
+    """
+
+    def __init__(self, context, size=DETAIL_CONCURRENCY, rps=DETAIL_RPS):
+        self._context = context
+        self._size = max(size, 1)
+        self._limiter = RateLimiter(rps)
+        # One slot per page that may be lent out; held for the whole fetch
+        self._slots = asyncio.Semaphore(self._size)
+        self._idle = []
+
+    async def _acquire(self):
+        """Idle page or a new one; the caller holds a slot."""
+        while self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                return page
+        return await self._context.new_page()
+
+    def _release(self, page):
+        if not page.is_closed():
+            self._idle.append(page)
+
+    async def fetch_all(self, fetch_detail_content, links, fetch_static=None):
+        """Run fetch_detail_content(page, link) for every link; results come back in link order.
+
+        If given, `fetch_static(link)` (no browser, e.g. a plain GET) is tried
+        first, and a page is only used when it returns nothing. Every request
+        start waits on the pool's rate limiter.
+        """
+        static_slots = asyncio.Semaphore(self._size)
+
+        async def _one(link):
+            if fetch_static is not None:
+                async with static_slots:
+                    await self._limiter.wait()
+                    text = await fetch_static(link)
+                if text:
+                    return text
+            async with self._slots:
+                page = await self._acquire()
+                try:
+                    await self._limiter.wait()
+                    return await fetch_detail_content(page, link)
+                finally:
+                    self._release(page)
+
+        return await asyncio.gather(*(_one(link) for link in links))
+
+async def close_browser():
+    """Shut down the shared browser and the Playwright driver, if started."""
+    global _playwright, _browser
+    async with _lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
+def run_scraper(main):
+    """`python -m src.scrapers.<name>` entry point: run one scraper, then close Chromium."""
+    async def _run():
+        try:
+            await main()
+        finally:
+            await close_browser()
+
+    asyncio.run(_run())
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Plain-HTTP fetches for server-rendered pages.
+
+A GET is far cheaper than loading the page in Chromium, so detail pages that
+don't need JavaScript are fetched here first (see DetailPagePool.fetch_all).
+One pooled requests.Session is shared per process. The async helper runs
+each call on a worker thread so it doesn't block the event loop.
+"""
+import asyncio
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from ._browser import DETAIL_CONCURRENCY
+
+# Keep-alive connections per host; one per concurrent detail fetch
+HTTP_POOL_SIZE = DETAIL_CONCURRENCY
+HTTP_TIMEOUT = 30
+HTTP_RETRIES = 2
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+_session = None
+
+def get_session():
+    """Return the process-wide requests.Session, created on first call."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(HEADERS)
+        _session = session
+    return _session
+
+def fetch_html_sync(url, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES):
+    """GET `url` and return the raw body (bytes, so the parser picks the charset); None on any failure.
+
+    429 / 5xx answers are retried with exponential backoff (1s, 2s, ...).
+    Blocking; the sync scrapers call it directly.
+    """
+    try:
+        for attempt in range(retries + 1):
+            r = get_session().get(url, timeout=timeout)
+            if r.status_code in RETRY_STATUS and attempt < retries:
+                time.sleep(2 ** attempt)
+                continue
+            r.raise_for_status()
+            return r.content
+    except requests.RequestException:
+        return None
+
+async def fetch_html(url, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES):
+    """fetch_html_sync on a worker thread, for the async scrapers."""
+    return await asyncio.to_thread(fetch_html_sync, url, timeout, retries)
@@ -6,11 +6,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, parse_day_month_year,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+)
+from ._browser import (
+    DetailPagePool, class_strainer, click_and_wait_for_list, list_item_soups,
+    run_scraper, shared_context, wait_for_content
 )
 
 # ================= 配置区 =================
@@ -25,38 +29,44 @@ SOURCE = "bahamas"
 ENTITY = "巴哈马"
 CATEGORY = "news"
 
+# 列表条目（等待并提取列表）/ 正文容器（等待详情页就绪）
+LIST_ITEM_SELECTOR = "div.news_box"
+DETAIL_SELECTOR = "div.right_content"
+
 # ==========================================
 
-async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+# Detail pages: parse only the content container
+DETAIL_STRAINER = class_strainer("right_content", name="div")
+
+async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES, wait_selector=None):
     for i in range(retries):
         try:
             await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
+            if wait_selector:
+                await wait_for_content(page, wait_selector)
             return True
         except Exception:
             await asyncio.sleep(3)
     return False
 
+_MONTH_YEAR_RE = re.compile(r"([A-Za-z]+)\s+(\d{4})")
+
 def parse_date_text(dd: str, yy_span) -> datetime:
     dd = (dd or "").strip()
     month_year = yy_span.get_text(separator=" ").strip()
-    match = re.match(r"([A-Za-z]+)\s+(\d{4})", month_year)
+    match = _MONTH_YEAR_RE.match(month_year)
     if not match:
         return None
     month_str, year_str = match.groups()
-    date_str = f"{dd} {month_str} {year_str}"
-    try:
-        return datetime.strptime(date_str, "%d %b %Y")
-    except ValueError:
-        return None
+    return parse_day_month_year(f"{dd} {month_str} {year_str}")
 
 async def fetch_detail_content(page, link: str):
     for attempt in range(RETRY_TIMES):
         try:
             await page.goto(link, timeout=TIMEOUT, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
+            await wait_for_content(page, DETAIL_SELECTOR)
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
             content_div = soup.select_one("div.right_content")
             if not content_div:
                 return ""
@@ -75,30 +85,30 @@ async def fetch_detail_content(page, link: str):
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     
     std_rows = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
-        if not await safe_goto(page, LIST_URL):
+        if not await safe_goto(page, LIST_URL, wait_selector=LIST_ITEM_SELECTOR):
             print(f"[{SOURCE}] List page failed.")
             return
 
         count = 0
         while count < MAX_ARTICLES and not stop_early:
-            await page.wait_for_timeout(2000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            news_boxes = soup.select("div.news_box")
+            news_boxes = await list_item_soups(page, LIST_ITEM_SELECTOR)
             if not news_boxes:
                 break
 
+            pending = []
             for box in news_boxes:
                 if count >= MAX_ARTICLES or stop_early:
                     break
@@ -113,7 +123,7 @@ async def main():
                     continue
 
                 # STRICT DATE CHECK
-                if article_dt < start_dt:
+                if article_dt < min_date:
                     stop_early = True
                     break
 
@@ -130,12 +140,23 @@ async def main():
                 abs_p = box.select_one("div.info_cell > p:not(.category_div)")
                 list_abstract = abs_p.get_text(strip=True) if abs_p else ""
 
-                detail_page = await context.new_page()
-                content_text = await fetch_detail_content(detail_page, link)
-                await detail_page.close()
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    continue
 
+                pending.append((article_dt, title, link, list_abstract))
+                visited_links.add(link)
+                count += 1
+
+            # Detail pages for this list page, fetched concurrently (results in list order)
+            contents = await detail_pages.fetch_all(fetch_detail_content, [link for _, _, link, _ in pending])
+            for (article_dt, title, link, list_abstract), content_text in zip(pending, contents):
+                # content_text is already sanitized by fetch_detail_content
+                title = sanitize_text(title, one_line=True)
+                list_abstract = sanitize_text(list_abstract, one_line=True)
                 if not content_text:
-                    content_text = sanitize_text(list_abstract or title, one_line=True)
+                    content_text = list_abstract or title
 
                 article_date_str = article_dt.strftime("%Y-%m-%d")
                 log_item(SOURCE, "NEW", article_date_str, title, link)
@@ -146,17 +167,14 @@ async def main():
                     "entity": ENTITY,
                     "category": CATEGORY,
                     "published_at": article_date_str,
-                    "title": sanitize_text(title, one_line=True),
+                    "title": title,
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text(list_abstract, one_line=True),
-                    "content": sanitize_text(content_text, one_line=True),
+                    "abstract": list_abstract,
+                    "content": content_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
 
-                visited_links.add(link)
-                count += 1
-
             if stop_early:
                 break
 
@@ -167,18 +185,16 @@ async def main():
                     next_a = await page.query_selector('ul.ac-pagination li:not(.active) a')
 
                 if next_a:
-                    await next_a.click()
-                    await page.wait_for_load_state("domcontentloaded")
-                    await page.wait_for_timeout(4000)
+                    await click_and_wait_for_list(page, next_a, LIST_ITEM_SELECTOR)
                     continue
                 break
             except Exception:
                 break
 
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
@@ -5,13 +5,14 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
-from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
+from bs4 import BeautifulSoup, SoupStrainer
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import DetailPagePool, class_strainer, run_scraper, shared_context, wait_for_content
+from ._http import fetch_html
 
 # ================= 配置区 =================
 MAX_ARTICLES = 200
@@ -25,79 +26,96 @@ SOURCE = "bcra"
 ENTITY = "阿根廷"
 CATEGORY = "news"
 
+# 列表条目 / 正文容器（用于等待页面就绪）
+LIST_ITEM_SELECTOR = "span.fecha-tabla"
+DETAIL_SELECTOR = "div.clearfix.pagina-interior"
+
 # ==========================================
 
-async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+# Parse only the article container / the news table body
+DETAIL_STRAINER = class_strainer("pagina-interior", name="div")
+LIST_STRAINER = SoupStrainer("tbody")
+
+async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES, wait_selector=None):
     for i in range(retries):
         try:
             await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
+            if wait_selector:
+                await wait_for_content(page, wait_selector)
             return True
         except Exception as e:
             await asyncio.sleep(3)
     return False
 
+_DATE_RE = re.compile(r"(\d{1,2})/(\d{1,2})/(\d{4})")
+
 def parse_date_text(date_raw: str) -> str:
     if not date_raw:
         return datetime.now().strftime("%Y-%m-%d")
     date_raw = date_raw.strip()
-    m = re.match(r"(\d{1,2})/(\d{1,2})/(\d{4})", date_raw)
+    m = _DATE_RE.match(date_raw)
     if m:
         mm, dd, yy = m.groups()
         return f"{int(yy):04d}-{int(mm):02d}-{int(dd):02d}"
     return datetime.now().strftime("%Y-%m-%d")
 
+def extract_detail_text(html):
+    soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
+    content_div = soup.select_one("div.clearfix.pagina-interior")
+    if not content_div:
+        return ""
+    paragraphs = []
+    h2 = content_div.select_one("h2")
+    if h2:
+        paragraphs.append(h2.get_text(strip=True))
+    for p in content_div.select("p.post-pagina-interior"):
+        t = p.get_text(separator=" ", strip=True)
+        if t:
+            paragraphs.append(t)
+    return sanitize_text("\n\n".join(paragraphs), one_line=True)
+
+async def fetch_static_content(link):
+    # News pages are server-rendered; Chromium is only the fallback
+    html = await fetch_html(link)
+    return extract_detail_text(html) if html else ""
+
 async def fetch_detail_content(page, link):
     for attempt in range(RETRY_TIMES):
         try:
             await page.goto(link, timeout=TIMEOUT, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            content_div = soup.select_one("div.clearfix.pagina-interior")
-            if content_div:
-                paragraphs = []
-                h2 = content_div.select_one("h2")
-                if h2:
-                    paragraphs.append(h2.get_text(strip=True))
-                for p in content_div.select("p.post-pagina-interior"):
-                    t = p.get_text(separator=" ", strip=True)
-                    if t:
-                        paragraphs.append(t)
-                content_text = "\n\n".join(paragraphs)
-            else:
-                content_text = ""
-            return sanitize_text(content_text, one_line=True)
+            await wait_for_content(page, DETAIL_SELECTOR)
+            return extract_detail_text(await page.content())
         except Exception:
             await asyncio.sleep(3)
     return ""
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     min_date_str = start_dt.strftime("%Y-%m-%d")
     
     std_rows = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
-        if not await safe_goto(page, LIST_URL):
+        if not await safe_goto(page, LIST_URL, wait_selector=LIST_ITEM_SELECTOR):
             print(f"[{SOURCE}] List page failed.")
             return
 
-        await page.wait_for_timeout(2000)
         html = await page.content()
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml", parse_only=LIST_STRAINER)
 
         rows = soup.select("tbody tr")
         if not rows:
             print("未检测到文章块，停止。")
 
         count = 0
+        pending = []
         for row in rows:
             if count >= MAX_ARTICLES or stop_early:
                 break
@@ -126,12 +144,25 @@ async def main():
             title = link_tag.get_text(strip=True)
             list_abstract = ""
 
-            detail_page = await context.new_page()
-            content_text = await fetch_detail_content(detail_page, link)
-            await detail_page.close()
+            # Already in the history CSV: no detail fetch needed
+            if make_uid(SOURCE, link) in seen_uids:
+                visited_links.add(link)
+                continue
+
+            pending.append((article_date, title, link, list_abstract))
+            visited_links.add(link)
+            count += 1
 
+        # Detail pages for this list page, fetched concurrently (results in list order)
+        contents = await detail_pages.fetch_all(
+            fetch_detail_content, [link for _, _, link, _ in pending], fetch_static=fetch_static_content
+        )
+        for (article_date, title, link, list_abstract), content_text in zip(pending, contents):
+            # content_text is already sanitized by fetch_detail_content
+            title = sanitize_text(title, one_line=True)
+            list_abstract = sanitize_text(list_abstract, one_line=True)
             if not content_text:
-                content_text = sanitize_text(title, one_line=True)
+                content_text = title
 
             log_item(SOURCE, "NEW", article_date, title, link)
 
@@ -140,22 +171,19 @@ async def main():
                 "source": SOURCE,
                 "entity": ENTITY,
                 "category": CATEGORY,
-                "published_at": sanitize_text(article_date, one_line=True),
-                "title": sanitize_text(title, one_line=True),
+                "published_at": article_date,
+                "title": title,
                 "url": sanitize_text(link, one_line=True),
-                "abstract": sanitize_text(list_abstract, one_line=True),
-                "content": sanitize_text(content_text, one_line=True),
+                "abstract": list_abstract,
+                "content": content_text,
                 "content_type": "html",
-                "crawl_time": utc_now_str(),
+                "crawl_time": crawl_ts,
             })
 
-            visited_links.add(link)
-            count += 1
-
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
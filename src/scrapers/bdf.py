@@ -7,12 +7,17 @@ from pathlib import Path
 
 from bs4 import BeautifulSoup
 from dateutil import parser
-from playwright.async_api import async_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, parse_day_month_year,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import (
+    DetailPagePool, class_strainer, click_and_wait_for_list, list_item_soups,
+    run_scraper, shared_context, wait_for_content
+)
+from ._http import fetch_html
 
 # ================= 配置区 =================
 MAX_ARTICLES = 200
@@ -26,79 +31,99 @@ SOURCE = "bdf"
 ENTITY = "法国"
 CATEGORY = "search"
 
+# 列表条目（等待并提取列表）/ 正文容器（等待详情页就绪）
+LIST_ITEM_SELECTOR = "div.views-row"
+DETAIL_SELECTOR = "div.rich-text, div.field__item"
+
 # ==========================================
 
-async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+# Detail pages: parse only the content container
+DETAIL_STRAINER = class_strainer("rich-text", "field__item", name="div")
+
+# Tags whose text makes up the article (a set is the cheapest find_all filter)
+DETAIL_TEXT_TAGS = frozenset({"p", "h1", "h2", "h3", "h4", "strong"})
+
+async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES, wait_selector=None):
     for i in range(retries):
         try:
-            await page.goto(url, timeout=timeout, wait_until="networkidle")
-            await page.wait_for_timeout(3000)
+            await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
+            if wait_selector:
+                await wait_for_content(page, wait_selector)
             return True
         except Exception:
             await asyncio.sleep(3)
     return False
 
+_ORDINAL_OF_RE = re.compile(r"(\d+)(st|nd|rd|th)\s+of\s+", re.I)
+
 def parse_date_text(date_raw: str):
     if not date_raw:
         return None
-    date_raw = re.sub(r"(\d+)(st|nd|rd|th)\s+of\s+", r"\1 ", date_raw, flags=re.I)
+    date_raw = _ORDINAL_OF_RE.sub(r"\1 ", date_raw)
+    dt = parse_day_month_year(date_raw)
+    if dt is not None:
+        return dt
+    # Unexpected format: fall back to the (much slower) fuzzy parser
     try:
-        return parser.parse(date_raw, fuzzy=True)
+        # Naive, like the table lookup, even if the text carries a zone
+        return parser.parse(date_raw, fuzzy=True).replace(tzinfo=None)
     except Exception:
         return None
 
+def extract_detail_text(html):
+    soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
+    content_div = soup.select_one("div.rich-text") or soup.select_one("div.field__item")
+    if not content_div:
+        return ""
+    paragraphs = []
+    for p in content_div.find_all(DETAIL_TEXT_TAGS):
+        t = p.get_text(separator=" ", strip=True)
+        if t:
+            paragraphs.append(t)
+    return sanitize_text("\n\n".join(paragraphs), one_line=True)
+
+async def fetch_static_content(link):
+    # Detail pages are server-rendered: a plain GET usually has the full text
+    html = await fetch_html(link)
+    return extract_detail_text(html) if html else ""
+
 async def fetch_detail_content(page, link):
     for attempt in range(RETRY_TIMES):
         try:
-            await page.goto(link, timeout=TIMEOUT, wait_until="networkidle")
-            await page.wait_for_timeout(3000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            content_div = soup.select_one("div.rich-text") or soup.select_one("div.field__item")
-            if content_div:
-                paragraphs = []
-                for p in content_div.find_all(["p", "h1", "h2", "h3", "h4", "strong"]):
-                    t = p.get_text(separator=" ", strip=True)
-                    if t:
-                        paragraphs.append(t)
-                content_text = "\n\n".join(paragraphs)
-            else:
-                content_text = ""
-            return sanitize_text(content_text, one_line=True)
+            await page.goto(link, timeout=TIMEOUT, wait_until="domcontentloaded")
+            await wait_for_content(page, DETAIL_SELECTOR)
+            return extract_detail_text(await page.content())
         except Exception:
             await asyncio.sleep(3)
     return ""
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     
     std_rows = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
-        if not await safe_goto(page, LIST_URL):
+        if not await safe_goto(page, LIST_URL, wait_selector=LIST_ITEM_SELECTOR):
             print(f"[{SOURCE}] List page failed.")
             return
 
         count = 0
         while count < MAX_ARTICLES and not stop_early:
-            try:
-                await page.wait_for_selector("li.news-list-item", timeout=30000)
-            except Exception:
-                pass
-
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            posts = soup.select("div.views-row")
+            # List readiness was awaited by safe_goto / click_and_wait_for_list
+            posts = await list_item_soups(page, LIST_ITEM_SELECTOR)
             if not posts:
                 break
 
+            pending = []
             for post in posts:
                 if count >= MAX_ARTICLES or stop_early:
                     break
@@ -112,7 +137,7 @@ async def main():
                     continue
 
                 # STRICT DATE CHECK
-                if dt < start_dt:
+                if dt < min_date:
                     stop_early = True
                     break
 
@@ -132,12 +157,25 @@ async def main():
                 abs_p = post.select_one("p.card-text")
                 list_abstract = abs_p.get_text(strip=True) if abs_p else ""
 
-                detail_page = await context.new_page()
-                content_text = await fetch_detail_content(detail_page, link)
-                await detail_page.close()
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    continue
+
+                pending.append((dt, title, link, list_abstract))
+                visited_links.add(link)
+                count += 1
 
+            # Detail pages for this list page, fetched concurrently (results in list order)
+            contents = await detail_pages.fetch_all(
+                fetch_detail_content, [link for _, _, link, _ in pending], fetch_static=fetch_static_content
+            )
+            for (dt, title, link, list_abstract), content_text in zip(pending, contents):
+                # content_text is already sanitized by fetch_detail_content
+                title = sanitize_text(title, one_line=True)
+                list_abstract = sanitize_text(list_abstract, one_line=True)
                 if not content_text:
-                    content_text = sanitize_text(list_abstract or title, one_line=True)
+                    content_text = list_abstract or title
 
                 article_date_str = dt.strftime("%Y-%m-%d")
                 log_item(SOURCE, "NEW", article_date_str, title, link)
@@ -148,35 +186,30 @@ async def main():
                     "entity": ENTITY,
                     "category": CATEGORY,
                     "published_at": article_date_str,
-                    "title": sanitize_text(title, one_line=True),
+                    "title": title,
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text(list_abstract, one_line=True),
-                    "content": sanitize_text(content_text, one_line=True),
+                    "abstract": list_abstract,
+                    "content": content_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
 
-                visited_links.add(link)
-                count += 1
-
             if stop_early:
                 break
 
             try:
                 next_btn = await page.query_selector("li.pager__item--next a")
                 if next_btn and await next_btn.is_visible() and await next_btn.is_enabled():
-                    await next_btn.click()
-                    await page.wait_for_load_state("networkidle")
-                    await page.wait_for_timeout(4000)
+                    await click_and_wait_for_list(page, next_btn, LIST_ITEM_SELECTOR)
                 else:
                     break
             except Exception:
                 break
 
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
@@ -1,19 +1,27 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import csv
 import re
 import sys
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from playwright.sync_api import sync_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, EN_MONTHS,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import DetailPagePool, run_scraper, shared_context, wait_for_content
 
 # ================= 配置区 =================
 LIST_BASE_URL = "https://www.boj.or.jp/en/whatsnew/index.htm/"
+# 同时打开的详情页数
+DETAIL_PAGES = 5
+
+# 正文容器（等待详情页就绪）
+DETAIL_SELECTOR = "div.outline.mod_outer, div#content, div.main, article"
+# 列表渲染的最长等待（毫秒）
+LIST_WAIT_TIMEOUT = 30000
 
 SOURCE = "boj"
 ENTITY = "日本"
@@ -21,66 +29,92 @@ CATEGORY = "whatsnew"
 
 # ==========================================
 
+# "Mar. 5, 2024" at the start of a date string / of a list line ("+ " marks updated items)
+_BOJ_DATE_RE = re.compile(r"([A-Za-z]+)\.\s*(\d{1,2}),\s*(\d{4})")
+_DATE_LINE_RE = re.compile(r"^(\+?\s*[A-Za-z]+\.\s*\d{1,2},\s*\d{4})")
+# Same date pattern for the in-page wait (JS RegExp source)
+_DATE_LINE_JS = r"[A-Za-z]+\.\s*\d{1,2},\s*\d{4}"
+
+# Trimmed innerText of every `sel` match under `root`, in document order
+_INNER_TEXTS_JS = "(root, sel) => Array.from(root.querySelectorAll(sel), e => e.innerText.trim())"
+
 def parse_boj_date(date_text):
     date_text = (date_text or "").replace("&nbsp;", " ").strip()
-    match = re.match(r"([A-Za-z]+\.\s*\d{1,2},\s*\d{4})", date_text)
+    match = _BOJ_DATE_RE.match(date_text)
     if not match:
-        return None, None
-    raw = match.group(1)
+        return None
+    month_str, day, year = match.groups()
+    month = EN_MONTHS.get(month_str.lower())
+    if not month:
+        return None
     try:
-        dt = datetime.strptime(raw, "%b. %d, %Y")
-        return dt, dt.strftime("%Y-%m-%d")
-    except Exception:
-        return None, None
+        return datetime(int(year), month, int(day))
+    except ValueError:
+        return None
 
 def clean_text_to_single_line(text):
     if not text:
         return ""
-    return " ".join(str(text).replace("\n", " ").replace("\r", " ").replace("\t", " ").split())
+    # split() drops the same whitespace \s matches; no regex pass
+    return " ".join(str(text).split())
 
-def get_article_content(browser, url):
+async def get_article_content(page, url):
     if not url or not url.startswith("http"):
         return ""
-    context = browser.new_context()
-    page = context.new_page()
     try:
-        page.goto(url, timeout=90000, wait_until="networkidle")
-        page.wait_for_timeout(5000)
         if url.lower().endswith(".pdf"):
+            # Chromium downloads PDFs instead of rendering them; nothing to wait for
             return clean_text_to_single_line(f"[PDF] {url}")
-        full_text_parts = []
+        await page.goto(url, timeout=90000, wait_until="domcontentloaded")
+        await wait_for_content(page, DETAIL_SELECTOR)
         content_container = page.locator("div.outline.mod_outer, div#content, div.main, article, body > div").first
-        if content_container.count() > 0:
-            elements = content_container.locator("h1, h2, h3, p, li, ul.link-list01 a").all()
-            for elem in elements:
-                t = elem.inner_text().strip()
-                if t and len(t) > 5:
-                    full_text_parts.append(t)
+        # innerText of every block in one round trip, instead of one inner_text() call per element
+        if await content_container.count() > 0:
+            texts = await content_container.evaluate(_INNER_TEXTS_JS, "h1, h2, h3, p, li, ul.link-list01 a")
+            full_text_parts = [t for t in texts if len(t) > 5]
         else:
-            elements = page.locator("p, h2, h3").all()
-            for elem in elements:
-                t = elem.inner_text().strip()
-                if t and len(t) > 10:
-                    full_text_parts.append(t)
-        full_text = "\n\n".join(full_text_parts) if full_text_parts else page.inner_text("body")
+            texts = await page.eval_on_selector_all("p, h2, h3", "els => els.map(e => e.innerText.trim())")
+            full_text_parts = [t for t in texts if len(t) > 10]
+        full_text = "\n\n".join(full_text_parts) if full_text_parts else await page.inner_text("body")
         return clean_text_to_single_line(full_text)
     except Exception as e:
         return clean_text_to_single_line(f"[Error] {e}")
-    finally:
-        page.close()
-        context.close()
-
-def extract_list_page(page):
-    page.wait_for_load_state("networkidle")
-    page.wait_for_timeout(8000)
-    full_text = page.inner_text("body")
+
+async def page_anchors(page):
+    """(normalized lowercase text, href) of every link on the page, read in one round trip."""
+    return await page.eval_on_selector_all(
+        "a[href]",
+        "els => els.map(e => [e.textContent.replace(/\\s+/g, ' ').trim().toLowerCase(), e.getAttribute('href')])",
+    )
+
+def find_link(anchors, text):
+    """href of the first link whose text contains `text` (like Playwright's a:has-text), or ""."""
+    needle = " ".join(text.split()).lower()
+    if not needle:
+        return ""
+    for anchor_text, href in anchors:
+        if needle in anchor_text:
+            return href or ""
+    return ""
+
+async def extract_list_page(page, min_date=None):
+    """Dated entries of the what's-new list in page order; entries before `min_date` are dropped while parsing."""
+    # The list is rendered client-side: wait until a dated entry is on the page
+    try:
+        await page.wait_for_function(
+            "re => new RegExp(re).test(document.body.innerText)", arg=_DATE_LINE_JS, timeout=LIST_WAIT_TIMEOUT
+        )
+    except Exception:
+        pass
+    full_text = await page.inner_text("body")
     lines = [line.strip() for line in full_text.split("\n") if line.strip()]
+    anchors = await page_anchors(page)
     results = []
     i = 0
     while i < len(lines):
         line = lines[i]
-        if re.match(r"^(\+?\s*[A-Za-z]+\.\s*\d{1,2},\s*\d{4})", line):
-            dt, date_str = parse_boj_date(line)
+        if _DATE_LINE_RE.match(line):
+            dt = parse_boj_date(line)
             if not dt:
                 i += 1
                 continue
@@ -88,7 +122,7 @@ def extract_list_page(page):
             category = ""
             link = ""
             j = i + 1
-            while j < len(lines) and not re.match(r"^(\+?\s*[A-Za-z]+\.\s*\d{1,2},\s*\d{4})", lines[j]):
+            while j < len(lines) and not _DATE_LINE_RE.match(lines[j]):
                 candidate = lines[j]
                 if "[PDF" in candidate or candidate.endswith("]"):
                     title = candidate
@@ -97,76 +131,79 @@ def extract_list_page(page):
                 j += 1
             if not title:
                 title = lines[i + 1] if i + 1 < len(lines) else ""
-            try:
-                link_elem = page.locator(f'a:has-text("{title[:50]}")').first
-                if link_elem.count() > 0:
-                    link = link_elem.get_attribute("href")
-                    if link and not link.startswith("http"):
-                        link = "https://www.boj.or.jp" + link
-            except Exception:
-                link = ""
-            if title and date_str:
+            if min_date and dt < min_date:
+                # Out of the window: skip the link lookup. Not a break, since
+                # updated ("+") entries can sit out of date order
+                i = j
+                continue
+            link = find_link(anchors, title[:50])
+            if link and not link.startswith("http"):
+                link = "https://www.boj.or.jp" + link
+            if title:
                 results.append({
                     "date_obj": dt,
-                    "date_str": date_str,
                     "category": category,
                     "link": link,
                     "title": title,
                 })
             i = j - 1
         i += 1
-    results.sort(key=lambda x: x["date_obj"], reverse=True)
     return results
 
-def main():
+async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
     
     std_rows = []
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(LIST_BASE_URL, wait_until="networkidle")
-        page.wait_for_timeout(10000)
-
-        news_list = extract_list_page(page)
-        if news_list:
-            for item in news_list:
-                link = (item.get("link") or "").strip()
-                if not link:
-                    continue
-
-                dt = item["date_obj"]
-                # STRICT DATE CHECK
-                if dt and dt < start_dt:
-                    break
-
-                title = item.get("title", "")
-                cat = item.get("category") or CATEGORY
-                
-                full_content = get_article_content(browser, link)
-                
-                log_item(SOURCE, "NEW", item["date_str"], title, link)
-
-                std_rows.append({
-                    "uid": make_uid(SOURCE, link),
-                    "source": SOURCE,
-                    "entity": ENTITY,
-                    "category": sanitize_text(cat, one_line=True) or CATEGORY,
-                    "published_at": item["date_str"],
-                    "title": sanitize_text(title, one_line=True),
-                    "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text((full_content[:300] if full_content else ""), one_line=True),
-                    "content": sanitize_text(full_content, one_line=True),
-                    "content_type": "pdf" if link.lower().endswith(".pdf") else "html",
-                    "crawl_time": utc_now_str(),
-                })
-                time.sleep(2)
-
-        browser.close()
+    async with shared_context() as context:
+        page = await context.new_page()
+        detail_pages = DetailPagePool(context, size=DETAIL_PAGES)
+        await page.goto(LIST_BASE_URL, wait_until="domcontentloaded")
+
+        news_list = await extract_list_page(page, min_date)
+        pending = []
+        for item in news_list:
+            link = (item.get("link") or "").strip()
+            if not link:
+                continue
 
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+            # Already in the history CSV: no detail fetch needed
+            if make_uid(SOURCE, link) in seen_uids:
+                continue
+            pending.append((item, link))
+
+        # Articles, DETAIL_PAGES at a time (results in list order)
+        contents = await detail_pages.fetch_all(get_article_content, [link for _, link in pending])
+        for (item, link), full_content in zip(pending, contents):
+            title = item.get("title", "")
+            cat = item.get("category") or CATEGORY
+            date_str = item["date_obj"].strftime("%Y-%m-%d")
+
+            log_item(SOURCE, "NEW", date_str, title, link)
+            content = sanitize_text(full_content, one_line=True)
+
+            std_rows.append({
+                "uid": make_uid(SOURCE, link),
+                "source": SOURCE,
+                "entity": ENTITY,
+                "category": sanitize_text(cat, one_line=True) or CATEGORY,
+                "published_at": date_str,
+                "title": sanitize_text(title, one_line=True),
+                "url": sanitize_text(link, one_line=True),
+                "abstract": content[:300].rstrip(),
+                "content": content,
+                "content_type": "pdf" if link.lower().endswith(".pdf") else "html",
+                "crawl_time": crawl_ts,
+            })
+
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    main()
+    run_scraper(main)
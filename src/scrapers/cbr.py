@@ -1,19 +1,28 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import csv
 import sys
-import time
-from datetime import datetime, timedelta
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+
+from bs4 import BeautifulSoup
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, parse_day_month_year,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import DetailPagePool, click_and_wait_for_list, run_scraper, shared_context, wait_for_content
+from ._http import fetch_html
 
 # ================= 配置区 =================
 LIST_BASE_URL = "https://www.cbr.ru/eng/"
 MAX_PAGES = 50
+# 同时打开的详情页数（对 cbr 保持克制）
+DETAIL_PAGES = 5
+
+# 列表条目 / 正文容器（等待页面就绪）
+LIST_ITEM_SELECTOR = "div.news"
+DETAIL_SELECTOR = "div.full_text, div.article_body, div.content"
 
 SOURCE = "cbr"
 ENTITY = "俄罗斯"
@@ -21,92 +30,109 @@ CATEGORY = "news"
 
 # ==========================================
 
+# [date, category, title, href] of every list entry, read in one round trip
+_LIST_ROWS_JS = """els => els.map(n => {
+    const text = sel => (n.querySelector(sel)?.innerText || "").trim();
+    const a = n.querySelector("a.news_title");
+    return [text("div.news_date"), text("div.news_category"), text("a.news_title"), a?.getAttribute("href") || ""];
+})"""
+
+# [container found?, innerText of each `blocks` match in it, or of every <p> on the page if it's missing]
+_DETAIL_TEXTS_JS = """([container, blocks]) => {
+    const root = document.querySelector(container);
+    const els = root ? root.querySelectorAll(blocks) : document.querySelectorAll('p');
+    return [!!root, Array.from(els, e => e.innerText)];
+}"""
+
 def clean_text_to_single_line(text):
     if not text:
         return ""
-    return " ".join(str(text).replace("\n", " ").replace("\r", " ").replace("\t", " ").split())
+    # split() drops the same whitespace \s matches; no regex pass
+    return " ".join(str(text).split())
+
+def extract_article_text(html):
+    """Article text from server-rendered HTML; "" if the content container isn't there."""
+    soup = BeautifulSoup(html, "lxml")
+    container = soup.select_one(DETAIL_SELECTOR)
+    if container is None:
+        return ""
+    paragraphs = [e.get_text(" ", strip=True) for e in container.select("p, h2, h3, div.paragraph")]
+    return clean_text_to_single_line(" ".join(paragraphs))
 
-def get_article_content(browser, url):
+async def fetch_static_content(url):
+    # Most article pages are plain HTML; Chromium is only the fallback
+    if not url or not url.startswith("http"):
+        return ""
+    html = await fetch_html(url)
+    return extract_article_text(html) if html else ""
+
+async def get_article_content(page, url):
     if not url or not url.startswith("http"):
         return ""
-    context = browser.new_context()
-    page = context.new_page()
     full_text = ""
     try:
-        page.goto(url, timeout=60000, wait_until="domcontentloaded")
-        page.wait_for_timeout(3000)
-        content_selector = page.locator("div.full_text, div.article_body, div.content").first
-        if content_selector.count() > 0:
-            paragraphs = content_selector.locator("p, h2, h3, div.paragraph").all_inner_texts()
-            full_text = " ".join(paragraphs)
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        await wait_for_content(page, DETAIL_SELECTOR)
+        # Container check and texts in one round trip
+        found, texts = await page.evaluate(_DETAIL_TEXTS_JS, [DETAIL_SELECTOR, "p, h2, h3, div.paragraph"])
+        if found:
+            full_text = " ".join(texts)
         else:
-            all_p = page.locator("p").all_inner_texts()
+            all_p = texts
             if len(all_p) > 5:
                 full_text = " ".join(all_p[2:-3])
             else:
                 full_text = " ".join(all_p)
     except Exception:
         pass
-    finally:
-        page.close()
-        context.close()
     return clean_text_to_single_line(full_text)
 
-def extract_list_page(page):
-    page.wait_for_selector("#events_tab100", timeout=30000)
-    page.wait_for_timeout(1500)
-    items = page.locator("div.news").all()
+async def extract_list_page(page, min_date=None):
+    """List entries in page order (newest first), up to and including the first one before `min_date`."""
+    await page.wait_for_selector("#events_tab100", timeout=30000)
+    await wait_for_content(page, LIST_ITEM_SELECTOR)
+    rows = await page.eval_on_selector_all(LIST_ITEM_SELECTOR, _LIST_ROWS_JS)
     results = []
-    for item in items:
-        try:
-            date_elem = item.locator("div.news_date").first
-            date_str = date_elem.inner_text().strip() if date_elem.count() > 0 else ""
-            category_elem = item.locator("div.news_category").first
-            category = category_elem.inner_text().strip() if category_elem.count() > 0 else ""
-            title_elem = item.locator("a.news_title").first
-            title = title_elem.inner_text().strip() if title_elem.count() > 0 else ""
-            link = title_elem.get_attribute("href") if title_elem.count() > 0 else ""
-            if link and not link.startswith("http"):
-                link = "https://www.cbr.ru" + link
-            date_obj = None
-            try:
-                if date_str:
-                    date_obj = datetime.strptime(date_str, "%d %B %Y")
-            except Exception:
-                date_obj = None
-            if title and link and date_obj:
-                results.append({
-                    "date_obj": date_obj,
-                    "date_str": date_obj.strftime("%Y-%m-%d"),
-                    "category": category,
-                    "link": link,
-                    "title": title,
-                })
-        except Exception:
-            continue
-    results.sort(key=lambda x: x["date_obj"], reverse=True)
+    for date_str, category, title, link in rows:
+        if link and not link.startswith("http"):
+            link = "https://www.cbr.ru" + link
+        date_obj = parse_day_month_year(date_str)
+        if title and link and date_obj:
+            results.append({
+                "date_obj": date_obj,
+                "category": category,
+                "link": link,
+                "title": title,
+            })
+            # The feed is date-ordered: the first older entry is where main stops paging
+            if min_date and date_obj < min_date:
+                break
     return results
 
-def main():
+async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
     
     std_rows = []
     visited_links = set()
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto(LIST_BASE_URL, wait_until="domcontentloaded")
-        page.wait_for_timeout(5000)
+    async with shared_context() as context:
+        page = await context.new_page()
+        await page.goto(LIST_BASE_URL, wait_until="domcontentloaded")
+        detail_pages = DetailPagePool(context, size=DETAIL_PAGES)
 
         keep_scraping = True
         page_num = 1
 
         while keep_scraping and page_num <= MAX_PAGES:
-            news_list = extract_list_page(page)
+            news_list = await extract_list_page(page, min_date)
             if not news_list:
                 break
 
+            pending = []
             for item in news_list:
                 link = item["link"]
                 if link in visited_links:
@@ -114,49 +140,58 @@ def main():
 
                 dt = item["date_obj"]
                 # STRICT DATE CHECK
-                if dt and dt < start_dt:
+                if dt and dt < min_date:
                     keep_scraping = False
                     break
 
+                visited_links.add(link)
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    continue
+                pending.append(item)
+
+            # Articles of this batch, DETAIL_PAGES at a time (results in list order)
+            contents = await detail_pages.fetch_all(
+                get_article_content, [item["link"] for item in pending], fetch_static=fetch_static_content
+            )
+            for item, full_content in zip(pending, contents):
+                link = item["link"]
                 title = item["title"]
                 category = item.get("category") or CATEGORY
-                
-                full_content = get_article_content(browser, link)
-                
-                log_item(SOURCE, "NEW", item["date_str"], title, link)
+                date_str = item["date_obj"].strftime("%Y-%m-%d")
+
+                log_item(SOURCE, "NEW", date_str, title, link)
+                content = sanitize_text(full_content, one_line=True)
 
                 std_rows.append({
                     "uid": make_uid(SOURCE, link),
                     "source": SOURCE,
                     "entity": ENTITY,
                     "category": sanitize_text(category, one_line=True) or CATEGORY,
-                    "published_at": item["date_str"],
+                    "published_at": date_str,
                     "title": sanitize_text(title, one_line=True),
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text((full_content[:300] if full_content else ""), one_line=True),
-                    "content": sanitize_text(full_content, one_line=True),
+                    "abstract": content[:300].rstrip(),
+                    "content": content,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
-                visited_links.add(link)
-                time.sleep(1)
 
             if keep_scraping:
                 load_more_button = page.locator("button#_buttonLoadNextEvt.more-button._small._home-news").first
-                if load_more_button.count() > 0 and load_more_button.is_visible() and load_more_button.is_enabled():
+                if await load_more_button.count() > 0 and await load_more_button.is_visible() and await load_more_button.is_enabled():
                     try:
-                        load_more_button.click()
-                        page.wait_for_timeout(5000)
+                        await click_and_wait_for_list(page, load_more_button, LIST_ITEM_SELECTOR)
                         page_num += 1
                     except Exception:
                         break
                 else:
                     break
 
-        browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    main()
+    run_scraper(main)
@@ -1,57 +1,67 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import csv
 import sys
-import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 from ..utils import (
-    STANDARD_FIELDS, env_int, make_uid,
+    STANDARD_FIELDS, env_int, make_uid, ensure_csv_field_size_limit,
     sanitize_text, utc_now_str, write_incremental_csv,
     log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import DetailPagePool, run_scraper, shared_context
+from ._http import fetch_html
 
 # ======================== 输出配置 ========================
 SOURCE = "ecb"
 ENTITY = "欧央行"
 CATEGORY = "press"
 
+# 每次滚动后等待新条目出现的最长时间（毫秒）
+SCROLL_WAIT_MS = 2000
+
 # 回填开关
 BACKFILL_EMPTY_CONTENT = env_int("CBDC_BACKFILL_EMPTY_CONTENT", 1)
 BACKFILL_MAX = env_int("CBDC_BACKFILL_MAX", 20)
 
 # ======================== ECB 正文提取 ========================
+# Boilerplate removed before picking the content container
+ECB_UNWANTED = [
+    "header", "footer", "nav", "aside", "sup", ".ecb-doc-header", ".ecb-doc-footer",
+    ".ecb-social-sharing", ".related-topics", ".address-box", ".ecb-breadcrumbscontainer",
+    ".ecb-publicationDate", ".ecb-authors", ".info-box", "#cookieConsent", "#feedback",
+]
+# One selector group, so the boilerplate is found in a single tree walk
+_ECB_UNWANTED_SELECTOR = ", ".join(ECB_UNWANTED)
+
+def _container_text(node) -> str:
+    texts = []
+    for el in node.select("h1,h2,h3,h4,p,li"):
+        txt = el.get_text(" ", strip=True)
+        if not txt:
+            continue
+        if el.name == "li" or len(txt) >= 20:
+            texts.append(txt)
+    return "\n\n".join(texts).strip()
+
 def extract_ecb_content(html):
     soup = BeautifulSoup(html, "lxml")
-    unwanted = [
-        "header", "footer", "nav", "aside", "sup", ".ecb-doc-header", ".ecb-doc-footer",
-        ".ecb-social-sharing", ".related-topics", ".address-box", ".ecb-breadcrumbscontainer",
-        ".ecb-publicationDate", ".ecb-authors", ".info-box", "#cookieConsent", "#feedback",
-    ]
-    
-    def _clean_container(container_html: str) -> str:
-        sub = BeautifulSoup(container_html, "lxml")
-        root = sub
-        for sel in unwanted:
-            for t in root.select(sel):
-                t.decompose()
-        texts = []
-        for el in root.select("h1,h2,h3,h4,p,li"):
-            txt = el.get_text(" ", strip=True)
-            if not txt:
-                continue
-            if el.name == "li" or len(txt) >= 20:
-                texts.append(txt)
-        return "\n\n".join(texts).strip()
+    # Strip boilerplate once, in place: every candidate below is a subtree of this
+    # soup, so none of them has to be serialized and re-parsed to be cleaned
+    for t in soup.select(_ECB_UNWANTED_SELECTOR):
+        # Matches come in document order; nested ones go with their ancestor
+        if not t.decomposed:
+            t.decompose()
 
     candidates = []
     main = soup.find("main")
     if main is not None:
         candidates.append(main)
-        candidates.extend(main.select("div.section"))
+    # Includes main's own sections; duplicates are skipped by id below
     candidates.extend(soup.select("div.section"))
     if not candidates:
         if soup.body is None:
@@ -59,8 +69,12 @@ def extract_ecb_content(html):
         candidates = [soup.body]
 
     best = ""
+    seen = set()
     for c in candidates:
-        text = _clean_container(str(c))
+        if id(c) in seen:
+            continue
+        seen.add(id(c))
+        text = _container_text(c)
         if len(text) > len(best):
             best = text
     return best
@@ -68,24 +82,29 @@ def extract_ecb_content(html):
 def extract_full_content(html):
     return extract_ecb_content(html)
 
+# ======================== HTTP ========================
+async def fetch_static_content(link):
+    # Press pages are static HTML; Playwright is only the fallback
+    html = await fetch_html(link)
+    return extract_full_content(html) if html else ""
+
 # ======================== Playwright ========================
-def extract_text_with_playwright(page, link):
+async def extract_text_with_playwright(page, link):
     try:
-        page.goto(link, timeout=30000, wait_until="networkidle")
-        page.wait_for_timeout(3000)
+        await page.goto(link, timeout=30000, wait_until="domcontentloaded")
         
         # Try to close cookie popup
         try:
             accept_btn = page.locator('button:has-text("Accept")').first
-            if accept_btn.is_visible(timeout=2000):
-                accept_btn.click()
-                page.wait_for_timeout(1000)
+            if await accept_btn.is_visible(timeout=2000):
+                await accept_btn.click()
+                await page.wait_for_timeout(1000)
         except:
             pass
         
         # Wait for content
-        page.wait_for_selector("div.section, main, article, p", timeout=15000)
-        html = page.content()
+        await page.wait_for_selector("div.section, main, article, p", timeout=15000)
+        html = await page.content()
         content = extract_full_content(html)
         return content
     except Exception as e:
@@ -113,141 +132,164 @@ def should_skip_link(link, title):
     return any(w in (title or "").lower() for w in skip_words)
 
 # ======================== ECB 专用滚动 ========================
-def scroll_to_bottom_ecb(page, max_scroll=35):
-    last_dt_count = 0
+# Number of listed dates and the last (oldest) one, read in one call
+_DT_STATE_JS = """() => {
+    const dts = document.querySelectorAll("dl dt");
+    return [dts.length, dts.length ? dts[dts.length - 1].innerText : ""];
+}"""
+
+async def scroll_to_bottom_ecb(page, min_date, max_scroll=35):
+    """Scroll until the oldest listed date is before `min_date`, or no more items load."""
     for i in range(max_scroll):
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(2000)
-        dts = page.locator("dl dt").count()
-        if dts == last_dt_count:
+        dt_count, last_dt = await page.evaluate(_DT_STATE_JS)
+        oldest = parse_date_text(last_dt)
+        if oldest and oldest < min_date:
+            break
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try:
+            await page.wait_for_function(
+                "n => document.querySelectorAll('dl dt').length > n", arg=dt_count, timeout=SCROLL_WAIT_MS
+            )
+        except PlaywrightTimeoutError:
+            # Nothing new within the wait: end of the list
             break
-        last_dt_count = dts
+
+# ======================== 历史去重 ========================
+def url_key(url):
+    """Lookup key for a URL: trailing slash and case don't make a different article."""
+    return url.strip().rstrip("/").lower()
+
+def load_history_urls(csv_path):
+    """(known URL keys, URL keys of rows with empty content) from one pass over the history CSV.
+
+    The second set is only collected when BACKFILL_EMPTY_CONTENT is on.
+    """
+    existing = set()
+    missing_content = set()
+    if not csv_path.exists():
+        return frozenset(), frozenset()
+    ensure_csv_field_size_limit()
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
+        # Only the url/content columns are needed: plain reader, no dict per history row
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if not header or "url" not in header:
+            return frozenset(), frozenset()
+        url_idx = header.index("url")
+        # No content column at all: every row counts as missing content
+        content_idx = header.index("content") if "content" in header else None
+        for row in reader:
+            if len(row) <= url_idx:
+                continue
+            u = url_key(row[url_idx])
+            if not u:
+                continue
+            existing.add(u)
+            if BACKFILL_EMPTY_CONTENT and (content_idx is None or len(row) <= content_idx or not row[content_idx]):
+                missing_content.add(u)
+    return frozenset(existing), frozenset(missing_content)
 
 # ======================== 主抓取逻辑 ========================
-def main():
+async def main():
     start_dt, end_dt = get_lookback_date_range()
+    # List dates parse as naive datetimes; compare them with a naive window start
+    min_date = start_dt.replace(tzinfo=None)
+    crawl_ts = utc_now_str()
     
-    # Load existing for dedupe check during run to save time
-    from ..utils import load_existing_keys
-    existing_uids, existing_urls = load_existing_keys(GLOBAL_ALL_CSV)
-    
-    # Missing content check for backfill
-    missing_content_urls = set()
-    if BACKFILL_EMPTY_CONTENT and GLOBAL_ALL_CSV.exists():
-        with GLOBAL_ALL_CSV.open("r", encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
-            if reader.fieldnames:
-                for row in reader:
-                    u = (row.get("url") or "").strip()
-                    if u and not row.get("content"):
-                        missing_content_urls.add(u)
+    existing_urls, missing_content_urls = load_history_urls(GLOBAL_ALL_CSV)
 
     results = []
     backfilled = 0
     
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(viewport={"width": 1920, "height": 1080})
-        page = context.new_page()
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
+        page = await context.new_page()
+        detail_pages = DetailPagePool(context)
+
+        await page.goto("https://www.ecb.europa.eu/press/pubbydate/html/index.en.html", 
+                        timeout=60000, wait_until="domcontentloaded")
         
+        # Close cookie popup if present
         try:
-            page.goto("https://www.ecb.europa.eu/press/pubbydate/html/index.en.html", 
-                     timeout=60000, wait_until="networkidle")
-            
-            # Close cookie popup if present
-            try:
-                accept_btn = page.locator('button:has-text("Accept")').first
-                if accept_btn.is_visible(timeout=5000):
-                    accept_btn.click()
-                    page.wait_for_timeout(1000)
-            except:
-                pass
-            
-            # Wait for content to load
-            page.wait_for_selector(".title a", timeout=30000)
-            
-            # Scroll to load more content
-            scroll_to_bottom_ecb(page)
-
-            html = page.content()
-            soup = BeautifulSoup(html, "lxml")
-            current_date_str = None
-            
-            for tag in soup.select("dl > dt, dl > dd"):
-                if tag.name == "dt":
-                    current_date_str = None
-                    
-                    raw = tag.get_text(strip=True)
-                    d = parse_date_text(raw)
-                    if d:
-                        current_date_str = d.strftime("%Y-%m-%d")
-                        # STRICT DATE CHECK
-                        if d < start_dt:
-                            break
-                    else:
-                        print(f"[ECB] Failed to parse date: {raw}")
+            accept_btn = page.locator('button:has-text("Accept")').first
+            if await accept_btn.is_visible(timeout=5000):
+                await accept_btn.click()
+                await page.wait_for_timeout(1000)
+        except:
+            pass
+        
+        # Wait for content to load
+        await page.wait_for_selector(".title a", timeout=30000)
+        
+        # Scroll to load more content
+        await scroll_to_bottom_ecb(page, min_date)
+
+        html = await page.content()
+        soup = BeautifulSoup(html, "lxml")
+        current_date_str = None
+        
+        # (status, published_at, title, link) of every article whose content we fetch
+        pending = []
+        for tag in soup.select("dl > dt, dl > dd"):
+            if tag.name == "dt":
+                current_date_str = None
+                
+                raw = tag.get_text(strip=True)
+                d = parse_date_text(raw)
+                if d:
+                    current_date_str = d.strftime("%Y-%m-%d")
+                    # STRICT DATE CHECK
+                    if d < min_date:
+                        break
+                else:
+                    print(f"[ECB] Failed to parse date: {raw}")
+                continue
+
+            if tag.name == "dd" and current_date_str:
+                a = tag.select_one(".title a")
+                if not a:
+                    continue
+                title = a.get_text(strip=True)
+                link = "https://www.ecb.europa.eu" + a["href"]
+
+                if should_skip_link(link, title):
+                    continue
+
+                key = url_key(link)
+                if key in existing_urls:
+                    # Backfill logic
+                    if BACKFILL_EMPTY_CONTENT and key in missing_content_urls and backfilled < BACKFILL_MAX:
+                        backfilled += 1
+                        pending.append(("BACKFILL", current_date_str, title, link))
                     continue
 
-                if tag.name == "dd" and current_date_str:
-                    a = tag.select_one(".title a")
-                    if not a:
-                        continue
-                    title = a.get_text(strip=True)
-                    link = "https://www.ecb.europa.eu" + a["href"]
-
-                    if should_skip_link(link, title):
-                        continue
-
-                    if link in existing_urls:
-                        # Backfill logic
-                        if BACKFILL_EMPTY_CONTENT and link in missing_content_urls and backfilled < BACKFILL_MAX:
-                            detail_page = context.new_page()
-                            full_content = extract_text_with_playwright(detail_page, link)
-                            detail_page.close()
-                            time.sleep(1)
-                            backfilled += 1
-                            results.append({
-                                "uid": make_uid(SOURCE, link),
-                                "source": SOURCE,
-                                "entity": ENTITY,
-                                "category": CATEGORY,
-                                "published_at": current_date_str,
-                                "title": sanitize_text(title, one_line=True),
-                                "url": link,
-                                "abstract": sanitize_text(full_content[:5000], one_line=True),
-                                "content": sanitize_text(full_content, one_line=True),
-                                "content_type": "html",
-                                "crawl_time": utc_now_str(),
-                            })
-                            log_item(SOURCE, "BACKFILL", current_date_str, title, link)
-                        continue
-
-                    detail_page = context.new_page()
-                    full_content = extract_text_with_playwright(detail_page, link)
-                    detail_page.close()
-                    time.sleep(1)
-                    
-                    log_item(SOURCE, "NEW", current_date_str, title, link)
-
-                    results.append({
-                        "uid": make_uid(SOURCE, link),
-                        "source": SOURCE,
-                        "entity": ENTITY,
-                        "category": CATEGORY,
-                        "published_at": current_date_str,
-                        "title": sanitize_text(title, one_line=True),
-                        "url": link,
-                        "abstract": sanitize_text(full_content[:5000], one_line=True),
-                        "content": sanitize_text(full_content, one_line=True),
-                        "content_type": "html",
-                        "crawl_time": utc_now_str(),
-                    })
-
-        finally:
-            browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=results, dedupe_by="uid", append_new=True)
+                pending.append(("NEW", current_date_str, title, link))
+
+        # Detail pages fetched concurrently, plain HTTP first (results in list order)
+        contents = await detail_pages.fetch_all(
+            extract_text_with_playwright, [link for _, _, _, link in pending], fetch_static=fetch_static_content
+        )
+        for (status, published_at, title, link), full_content in zip(pending, contents):
+            log_item(SOURCE, status, published_at, title, link)
+            content = sanitize_text(full_content, one_line=True)
+
+            results.append({
+                "uid": make_uid(SOURCE, link),
+                "source": SOURCE,
+                "entity": ENTITY,
+                "category": CATEGORY,
+                "published_at": published_at,
+                "title": sanitize_text(title, one_line=True),
+                "url": link,
+                "abstract": content[:5000].rstrip(),
+                "content": content,
+                "content_type": "html",
+                "crawl_time": crawl_ts,
+            })
+
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=results, dedupe_by="uid", append_new=True
+    )
     log_summary(SOURCE, len(results), new_count)
 
 if __name__ == "__main__":
-    main()
+    run_scraper(main)
@@ -1,15 +1,18 @@
 # -*- coding: utf-8 -*-
+import asyncio
 import csv
 import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from playwright.sync_api import sync_playwright
+from bs4 import BeautifulSoup
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
     log_item, log_summary, get_lookback_date_range, env_int, load_existing_keys, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import DetailPagePool, run_scraper, shared_context
+from ._http import fetch_html
 
 # ================= 配置区 =================
 SEARCH_URL = "https://www.imf.org/en/news/searchnews#q=%20&sortCriteria=%40imfdate%20descending"
@@ -26,121 +29,186 @@ CATEGORY = "news"
 # 有历史 all.csv 时：连续遇到多少条已抓取链接就停止（列表通常按时间倒序）
 SEEN_HIT_LIMIT = env_int("CBDC_SEEN_HIT_LIMIT", 30)
 
+# 正文容器候选（按优先级）
+CONTENT_SELECTORS = [".article-body", ".news-article", "article", "main"]
+
+# 结果卡片（Shadow DOM）渲染完成的最长等待（毫秒）
+LIST_RENDER_TIMEOUT_MS = env_int("CBDC_LIST_RENDER_TIMEOUT_MS", 15_000)
+
 # ==========================================
 
-def clean_text_to_single_line(text):
-    if not text:
+# First match for `sel` under root, looking into shadow roots (a root's own first);
+# only shadow hosts are descended into, so each node is visited once
+_DEEP_FIND_JS = """
+function deepFind(root, sel) {
+    if (root.shadowRoot) {
+        const inShadow = deepFind(root.shadowRoot, sel);
+        if (inShadow) return inShadow;
+    }
+    const hit = root.querySelector(sel);
+    if (hit) return hit;
+    for (const el of root.querySelectorAll('*')) {
+        if (el.shadowRoot) {
+            const found = deepFind(el.shadowRoot, sel);
+            if (found) return found;
+        }
+    }
+    return null;
+}
+"""
+
+# Every result card has rendered its link (inside its shadow DOM)
+_CARDS_RENDERED_JS = "() => {" + _DEEP_FIND_JS + """
+    const cards = document.querySelectorAll('atomic-result');
+    return cards.length > 0 && Array.from(cards).every(c => deepFind(c, 'a[href]'));
+}"""
+
+# href of the first card's link, "" until it has rendered
+_FIRST_CARD_LINK_JS = "() => {" + _DEEP_FIND_JS + """
+    const card = document.querySelector('atomic-result');
+    const a = card && deepFind(card, 'a[href]');
+    return a ? a.href : '';
+}"""
+
+# The first card has rendered a link other than `prev` (the pager moved on)
+_FIRST_CARD_CHANGED_JS = "(prev) => {" + _DEEP_FIND_JS + """
+    const card = document.querySelector('atomic-result');
+    const a = card && deepFind(card, 'a[href]');
+    return !!a && a.href !== prev;
+}"""
+
+# [title, link, dateStr, abstract] of every card
+_CARD_FIELDS_JS = "() => {" + _DEEP_FIND_JS + """
+    return Array.from(document.querySelectorAll('atomic-result'), (element) => {
+        const aTag = deepFind(element, 'a[href*="/news/articles/"]');
+        const dateNode = deepFind(element, 'atomic-text[value*=","]');
+        const abstractNode = deepFind(element, '[class*="excerpt"]');
+        return [
+            aTag ? aTag.innerText : '',
+            aTag ? aTag.href : '',
+            dateNode ? dateNode.getAttribute('value') : '',
+            abstractNode ? abstractNode.innerText : '',
+        ];
+    });
+}"""
+
+# Paragraph text of the first CONTENT_SELECTORS container with over 100 chars of it
+# (else the last one with any), else of every <p> on the page; one round trip
+_ARTICLE_TEXT_JS = """(selectors) => {
+    const texts = root => Array.from(root.querySelectorAll('p'), p => p.innerText);
+    let raw = '';
+    for (const sel of selectors) {
+        const container = document.querySelector(sel);
+        if (!container) continue;
+        const ps = texts(container);
+        if (ps.length) {
+            raw = ps.join(' ');
+            if (raw.trim().length > 100) return raw;
+        }
+    }
+    return raw || texts(document).join(' ');
+}"""
+
+def extract_article_text(html):
+    """Same container rules as the browser path, on server-rendered HTML; "" if none has enough text."""
+    soup = BeautifulSoup(html, "lxml")
+    for selector in CONTENT_SELECTORS:
+        container = soup.select_one(selector)
+        if container is not None:
+            text = " ".join(p.get_text(" ", strip=True) for p in container.find_all("p"))
+            if len(text.strip()) > 100:
+                return sanitize_text(text, one_line=True)
+    return ""
+
+async def fetch_static_content(url):
+    """Article text from a plain GET (article pages are server-rendered); "" if that fails."""
+    if not url or "http" not in url:
         return ""
-    return " ".join(str(text).replace("\n", " ").replace("\r", " ").replace("\t", " ").split())
+    html = await fetch_html(url)
+    return extract_article_text(html) if html else ""
 
-def get_article_content(browser, url):
+async def get_article_content(page, url):
+    """Article text rendered in a pooled detail page; for pages the plain GET couldn't read."""
     if not url or "http" not in url:
         return ""
-    context = browser.new_context()
-    detail_page = context.new_page()
     raw_content = ""
     try:
-        detail_page.goto(url, timeout=60000, wait_until="domcontentloaded")
-        selectors = [".article-body", ".news-article", "article", "main"]
-        for selector in selectors:
-            container = detail_page.locator(selector).first
-            if container.count() > 0:
-                p_texts = container.locator("p").all_inner_texts()
-                if p_texts:
-                    raw_content = " ".join(p_texts)
-                    if len(raw_content.strip()) > 100:
-                        break
-        if not raw_content:
-            raw_content = " ".join(detail_page.locator("p").all_inner_texts())
+        await page.goto(url, timeout=60000, wait_until="domcontentloaded")
+        raw_content = await page.evaluate(_ARTICLE_TEXT_JS, CONTENT_SELECTORS)
     except Exception:
         pass
-    finally:
-        detail_page.close()
-        context.close()
-    return clean_text_to_single_line(raw_content)
-
-def extract_list_page(page):
-    page.wait_for_selector("atomic-result", timeout=NAV_TIMEOUT_MS)
-    page.wait_for_timeout(5000)  # Increased wait time for Shadow DOM
-    cards = page.locator("atomic-result").all()
+    return sanitize_text(raw_content, one_line=True)
+
+async def extract_list_page(page):
+    await page.wait_for_selector("atomic-result", timeout=NAV_TIMEOUT_MS)
+    # Shadow DOM content renders after the cards are attached
+    try:
+        await page.wait_for_function(_CARDS_RENDERED_JS, timeout=LIST_RENDER_TIMEOUT_MS)
+    except Exception:
+        pass
+    # Every card in one round trip instead of one evaluate per card, as
+    # [title, link, dateStr, abstract] arrays (no repeated keys in the payload)
+    data_list = await page.evaluate(_CARD_FIELDS_JS)
     results = []
-    for card in cards:
-        data = card.evaluate(
-            """(element) => {
-            function getAllElements(root, list = []) {
-                list.push(root);
-                if (root.shadowRoot) getAllElements(root.shadowRoot, list);
-                let children = root.querySelectorAll('*');
-                for (let child of children) { getAllElements(child, list); }
-                return list;
-            }
-            const allNodes = getAllElements(element);
-            const aTag = allNodes.find(n => n.tagName === 'A' && n.href && n.href.includes('/news/articles/'));
-            const dateNode = allNodes.find(n => n.tagName === 'ATOMIC-TEXT' && n.getAttribute('value') && n.getAttribute('value').includes(','));
-            const abstractNode = allNodes.find(n => n.className && n.className.includes('excerpt'));
-            return {
-                title: aTag ? aTag.innerText : '',
-                link: aTag ? aTag.href : '',
-                dateStr: dateNode ? dateNode.getAttribute('value') : '',
-                abstract: abstractNode ? abstractNode.innerText : ''
-            };
-        }"""
-        )
+    for title, link, date_str, abstract in data_list:
         try:
-            current_item_date = datetime.strptime(data["dateStr"], "%B %d, %Y")
+            current_item_date = datetime.strptime(date_str, "%B %d, %Y")
         except Exception:
             current_item_date = None
         
-        if data["title"] and data["link"]:
+        if title and link:
             results.append({
                 "date_obj": current_item_date,
-                "date_str": current_item_date.strftime("%Y-%m-%d") if current_item_date else data["dateStr"],
-                "link": data["link"],
-                "title": data["title"].strip(),
-                "abstract": data["abstract"].strip(),
+                "date_str": current_item_date.strftime("%Y-%m-%d") if current_item_date else date_str,
+                "link": link,
+                "title": title.strip(),
+                "abstract": abstract.strip(),
             })
     return results
 
-def main():
+async def main():
     # Load existing history for deduplication optimization
     existing_uids, existing_urls = load_existing_keys(GLOBAL_ALL_CSV)
     
     start_dt, end_dt = get_lookback_date_range()
-    min_date_str = start_dt.strftime("%Y-%m-%d")
+    crawl_ts = utc_now_str()
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
     
     std_rows = []
     visited = set()
     consecutive_seen = 0
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    async with shared_context() as context:
+        page = await context.new_page()
         page.set_default_timeout(NAV_TIMEOUT_MS)
         page.set_default_navigation_timeout(NAV_TIMEOUT_MS)
+        detail_pages = DetailPagePool(context)
 
         last_err = None
         for attempt in range(1, NAV_RETRIES + 1):
             try:
-                page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
+                await page.goto(SEARCH_URL, wait_until="domcontentloaded", timeout=NAV_TIMEOUT_MS)
                 last_err = None
                 break
             except Exception as e:
                 last_err = e
                 print(f"⚠️ IMF 列表页打开失败（{attempt}/{NAV_RETRIES}）：{e}")
-                page.wait_for_timeout(1500)
+                await page.wait_for_timeout(1500)
         
         if last_err is not None:
-            browser.close()
             raise last_err
 
         page_num = 1
         while page_num <= MAX_PAGES:
             print(f"\n📂 扫描第 {page_num} 页...")
-            list_items = extract_list_page(page)
+            list_items = await extract_list_page(page)
             if not list_items:
                 print("❌ 未能获取列表，结束。")
                 break
 
+            stop = False
+            pending = []
             for item in list_items:
                 link = (item.get("link") or "").strip()
                 if not link or link in visited:
@@ -148,16 +216,11 @@ def main():
 
                 d = item.get("date_obj")
                 # STRICT DATE CHECK
-                if d:
-                    item_date = d.replace(tzinfo=None) # ensure naive comparison if needed
-                    # Note: start_dt from utils is naive or local, ensure consistency
-                    if item_date < start_dt:
-                        # IMF list is ordered, so we can stop
-                        print(f"🛑 发现历史日期 {item.get('date_str')} 早于窗口期，停止。")
-                        browser.close()
-                        new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
-                        log_summary(SOURCE, len(std_rows), new_count)
-                        return
+                if d and d < min_date:
+                    # IMF list is ordered, so we can stop
+                    print(f"🛑 发现历史日期 {item.get('date_str')} 早于窗口期，停止。")
+                    stop = True
+                    break
 
                 # Deduplication Optimization
                 if link in existing_urls:
@@ -165,20 +228,23 @@ def main():
                     consecutive_seen += 1
                     if consecutive_seen >= SEEN_HIT_LIMIT:
                         print(f"🛑 连续遇到已抓取 {SEEN_HIT_LIMIT} 条，停止。")
-                        browser.close()
-                        new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
-                        log_summary(SOURCE, len(std_rows), new_count)
-                        return
+                        stop = True
+                        break
                     continue
 
                 consecutive_seen = 0
                 visited.add(link)
+                pending.append((item, link))
+
+            # This page's articles, concurrently: plain HTTP first, a pooled page for what that missed
+            contents = await detail_pages.fetch_all(
+                get_article_content, [link for _, link in pending], fetch_static=fetch_static_content
+            )
+            for (item, link), full_text in zip(pending, contents):
                 title = item.get("title", "")
                 abstract = item.get("abstract", "")
 
                 print(f"   🔍 抓取正文: [{item.get('date_str')}] {title[:40]}...")
-                full_text = get_article_content(browser, link)
-                
                 log_item(SOURCE, "NEW", item.get("date_str", ""), title, link)
 
                 std_rows.append({
@@ -190,12 +256,17 @@ def main():
                     "title": sanitize_text(title, one_line=True),
                     "url": sanitize_text(link, one_line=True),
                     "abstract": sanitize_text(abstract, one_line=True),
-                    "content": sanitize_text(full_text, one_line=True),
+                    # Already sanitized by extract_article_text / get_article_content
+                    "content": full_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
 
-            success = page.evaluate(
+            if stop:
+                break
+
+            first_link = await page.evaluate(_FIRST_CARD_LINK_JS)
+            success = await page.evaluate(
                 """() => {
                 const btn = document.querySelector('atomic-pager')?.shadowRoot?.querySelector('button[aria-label="Next"]');
                 if(btn && btn.getAttribute('aria-disabled') !== 'true') {
@@ -209,12 +280,16 @@ def main():
                 print("🏁 已到达最后一页。")
                 break
             page_num += 1
-            page.wait_for_timeout(4000)
-
-        browser.close()
+            # Done once the first card shows a different article
+            try:
+                await page.wait_for_function(_FIRST_CARD_CHANGED_JS, arg=first_link, timeout=LIST_RENDER_TIMEOUT_MS)
+            except Exception:
+                pass
 
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    main()
+    run_scraper(main)
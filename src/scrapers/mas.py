@@ -6,11 +6,15 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, parse_day_month_year,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+)
+from ._browser import (
+    DetailPagePool, class_strainer, click_and_wait_for_list, list_item_soups,
+    run_scraper, shared_context, wait_for_content
 )
 
 # ================= 配置区 =================
@@ -25,13 +29,24 @@ SOURCE = "mas"
 ENTITY = "新加坡"
 CATEGORY = "news"
 
+# 列表条目（等待并提取列表）/ 正文容器（等待详情页就绪）
+LIST_ITEM_SELECTOR = "article.mas-search-card"
+DETAIL_SELECTOR = "div._mas-typeset, div.mas-rte-content"
+
 # ==========================================
 
-async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+# Detail pages: parse only the content container
+DETAIL_STRAINER = class_strainer("_mas-typeset", "mas-rte-content", name="div")
+
+# Tags whose text makes up the article
+DETAIL_TEXT_TAGS = frozenset({"p", "h1", "h2", "h3", "h4", "li", "td", "th"})
+
+async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES, wait_selector=None):
     for i in range(retries):
         try:
             await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
-            await page.wait_for_timeout(2000)
+            if wait_selector:
+                await wait_for_content(page, wait_selector)
             return True
         except Exception as e:
             await asyncio.sleep(3)
@@ -47,29 +62,27 @@ def parse_date_text(date_raw: str) -> str:
     else:
         date_part = date_raw
 
-    for fmt in ("%d %B %Y", "%d %b %Y"):
-        try:
-            dt = datetime.strptime(date_part, fmt)
-            return dt.strftime("%Y-%m-%d")
-        except Exception:
-            pass
-    return now.strftime("%Y-%m-%d")
+    dt = parse_day_month_year(date_part)
+    return (dt or now).strftime("%Y-%m-%d")
+
+# Trailing "***" / "End of Document" markers on MAS pages
+_END_MARKER_RE = re.compile(r"^\s*(\*{3}|End\s+of\s+Document)\s*$", re.I)
 
 async def fetch_detail_content(page, link):
     for attempt in range(RETRY_TIMES):
         try:
             await page.goto(link, timeout=TIMEOUT, wait_until="domcontentloaded")
-            await page.wait_for_timeout(2000)
+            await wait_for_content(page, DETAIL_SELECTOR)
 
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
 
             content_div = soup.select_one("div._mas-typeset") or soup.select_one("div.mas-rte-content")
             if content_div:
                 paragraphs = []
-                for elem in content_div.find_all(["p", "h1", "h2", "h3", "h4", "li", "td", "th"]):
+                for elem in content_div.find_all(DETAIL_TEXT_TAGS):
                     t = elem.get_text(separator=" ", strip=True)
-                    if t and not re.match(r"^\s*(\*{3}|End\s+of\s+Document)\s*$", t, re.I):
+                    if t and not _END_MARKER_RE.match(t):
                         paragraphs.append(t)
                 content_text = "\n\n".join(paragraphs)
             else:
@@ -82,32 +95,30 @@ async def fetch_detail_content(page, link):
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     min_date_str = start_dt.strftime("%Y-%m-%d")
     
     std_rows = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
-        if not await safe_goto(page, LIST_URL):
+        if not await safe_goto(page, LIST_URL, wait_selector=LIST_ITEM_SELECTOR):
             print(f"[{SOURCE}] List page failed.")
             return
 
         count = 0
         while count < MAX_ARTICLES and not stop_early:
-            await page.wait_for_timeout(2000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            posts = soup.select("article.mas-search-card")
+            posts = await list_item_soups(page, LIST_ITEM_SELECTOR)
             if not posts:
                 break
 
             new_added = 0
+            pending = []
             for post in posts:
                 if count >= MAX_ARTICLES or stop_early:
                     break
@@ -136,31 +147,40 @@ async def main():
                 abs_p = post.select_one(".mas-search-card__body p")
                 list_abstract = abs_p.get_text(strip=True) if abs_p else ""
 
-                detail_page = await context.new_page()
-                content_text = await fetch_detail_content(detail_page, link)
-                await detail_page.close()
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    new_added += 1
+                    continue
+
+                pending.append((article_date, title, link, list_abstract))
+                visited_links.add(link)
+                count += 1
+                new_added += 1
 
+            # Detail pages for this list page, fetched concurrently (results in list order)
+            contents = await detail_pages.fetch_all(fetch_detail_content, [link for _, _, link, _ in pending])
+            for (article_date, title, link, list_abstract), content_text in zip(pending, contents):
+                # content_text is already sanitized by fetch_detail_content
+                title = sanitize_text(title, one_line=True)
+                list_abstract = sanitize_text(list_abstract, one_line=True)
                 if not content_text:
-                    content_text = sanitize_text(list_abstract, one_line=True)
+                    content_text = list_abstract
 
                 std_rows.append({
                     "uid": make_uid(SOURCE, link),
                     "source": SOURCE,
                     "entity": ENTITY,
                     "category": CATEGORY,
-                    "published_at": sanitize_text(article_date, one_line=True),
-                    "title": sanitize_text(title, one_line=True),
+                    "published_at": article_date,
+                    "title": title,
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text(list_abstract, one_line=True),
-                    "content": sanitize_text(content_text, one_line=True),
+                    "abstract": list_abstract,
+                    "content": content_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
 
-                visited_links.add(link)
-                count += 1
-                new_added += 1
-                
                 log_item(SOURCE, "NEW", article_date, title, link)
 
             if stop_early or new_added == 0:
@@ -180,18 +200,16 @@ async def main():
                 next_button = await page.query_selector(next_selector)
 
                 if next_button and await next_button.is_visible():
-                    await next_button.click()
-                    await page.wait_for_load_state("domcontentloaded")
-                    await page.wait_for_timeout(3000)
+                    await click_and_wait_for_list(page, next_button, LIST_ITEM_SELECTOR)
                 else:
                     break
             except Exception:
                 break
 
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
@@ -1,17 +1,22 @@
 # -*- coding: utf-8 -*-
 import asyncio
-import re
 import sys
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, EN_MONTHS,
+    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import (
+    DetailPagePool, class_strainer, click_and_wait_for_list, list_item_soups, run_scraper,
+    shared_context, wait_for_content
+)
+from ._http import fetch_html
 
 # ================= 配置区 =================
 MAX_ARTICLES = 200
@@ -31,33 +36,37 @@ SOURCE = "mnb"
 ENTITY = "匈牙利"
 CATEGORY = "news"
 
+# 列表条目（等待并提取列表）/ 正文容器（等待详情页就绪）
+LIST_ITEM_SELECTOR = "li.news-list-item"
+DETAIL_SELECTOR = "div.c-ph"
+
 # ==========================================
 
-MONTH_MAP = {
-    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
-    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
-}
+# Detail pages: parse only the content container
+DETAIL_STRAINER = class_strainer("c-ph", name="div")
 
 async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+    # Readiness is checked by the caller (see _goto_first_working_list)
     for i in range(retries):
         try:
             await page.goto(url, timeout=timeout, wait_until="domcontentloaded")
-            await page.wait_for_timeout(5000)
             return True
         except Exception:
             await asyncio.sleep(3)
     return False
 
+@lru_cache(maxsize=256)
 def parse_date_text(date_raw: str) -> datetime:
+    """Parse "5 March 2024." into a naive datetime, or None; cached, since list items share dates."""
     if not date_raw:
         return None
     date_raw = date_raw.strip().rstrip(".").strip()
-    parts = re.split(r"\s+", date_raw)
+    parts = date_raw.split()
     if len(parts) != 3:
         return None
     try:
         day = int(parts[0])
-        month = MONTH_MAP.get(parts[1].lower())
+        month = EN_MONTHS.get(parts[1].lower())
         year = int(parts[2])
         if not month:
             return None
@@ -65,33 +74,49 @@ def parse_date_text(date_raw: str) -> datetime:
     except Exception:
         return None
 
+def extract_article_text(html):
+    """Sanitized article text from a detail page's HTML; "" if the content container isn't there."""
+    soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
+    content_div = soup.select_one("div.c-ph")
+    if not content_div:
+        return ""
+    paragraphs = []
+    for p in content_div.find_all("p"):
+        t = p.get_text(separator=" ", strip=True)
+        if t:
+            paragraphs.append(t)
+    return sanitize_text("\n\n".join(paragraphs), one_line=True)
+
+async def fetch_static_content(link):
+    # Article pages are server-rendered; Chromium is only the fallback
+    if not link or not link.startswith("http"):
+        return ""
+    html = await fetch_html(link)
+    return extract_article_text(html) if html else ""
+
 async def fetch_detail_content(page, link: str):
     for attempt in range(RETRY_TIMES):
         try:
             await page.goto(link, timeout=TIMEOUT, wait_until="domcontentloaded")
-            await page.wait_for_timeout(3000)
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            content_div = soup.select_one("div.c-ph")
-            if not content_div:
-                return ""
-            paragraphs = []
-            for p in content_div.find_all("p"):
-                t = p.get_text(separator=" ", strip=True)
-                if t:
-                    paragraphs.append(t)
-            return sanitize_text("\n\n".join(paragraphs), one_line=True)
+            await wait_for_content(page, DETAIL_SELECTOR)
+            return extract_article_text(await page.content())
         except Exception:
             await asyncio.sleep(3)
     return ""
 
+def absolute_link(href):
+    """`href` as an absolute URL: "http..." as is, "//host/..." as https, "/path" on BASE_URL."""
+    if not href or href.startswith("http"):
+        return href
+    return ("https:" if href.startswith("//") else BASE_URL) + href
+
 async def _goto_first_working_list(page) -> str:
     for url in CANDIDATE_LIST_URLS:
         ok = await safe_goto(page, url)
         if not ok:
             continue
         try:
-            await page.wait_for_selector("li.news-list-item", timeout=8000)
+            await page.wait_for_selector(LIST_ITEM_SELECTOR, timeout=8000)
             return url
         except Exception:
             continue
@@ -99,15 +124,18 @@ async def _goto_first_working_list(page) -> str:
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     
     std_rows = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
         list_url = await _goto_first_working_list(page)
         if not list_url:
@@ -117,17 +145,15 @@ async def main():
         count = 0
         while count < MAX_ARTICLES and not stop_early:
             try:
-                await page.wait_for_selector("li.news-list-item", timeout=30000)
+                await page.wait_for_selector(LIST_ITEM_SELECTOR, timeout=30000)
             except Exception:
                 break
 
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-
-            items = soup.select("li.news-list-item")
+            items = await list_item_soups(page, LIST_ITEM_SELECTOR)
             if not items:
                 break
 
+            pending = []
             for item in items:
                 if count >= MAX_ARTICLES or stop_early:
                     break
@@ -141,7 +167,7 @@ async def main():
                     continue
 
                 # STRICT DATE CHECK
-                if article_dt < start_dt:
+                if article_dt < min_date:
                     stop_early = True
                     break
 
@@ -149,23 +175,31 @@ async def main():
                 if not link_a:
                     continue
 
-                link = (link_a.get("href", "") or "").strip()
-                if link.startswith("//"):
-                    link = "https:" + link
-                elif link and not link.startswith("http"):
-                    link = BASE_URL + link
+                link = absolute_link((link_a.get("href", "") or "").strip())
 
                 if not link or link in visited_links:
                     continue
 
                 title = link_a.get_text(strip=True)
 
-                detail_page = await context.new_page()
-                content_text = await fetch_detail_content(detail_page, link)
-                await detail_page.close()
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    continue
 
+                pending.append((article_dt, title, link))
+                visited_links.add(link)
+                count += 1
+
+            # Detail pages for this list page, fetched concurrently (results in list order)
+            contents = await detail_pages.fetch_all(
+                fetch_detail_content, [link for _, _, link in pending], fetch_static=fetch_static_content
+            )
+            for (article_dt, title, link), content_text in zip(pending, contents):
+                # content_text is already sanitized by extract_article_text
+                title = sanitize_text(title, one_line=True)
                 if not content_text:
-                    content_text = sanitize_text(title, one_line=True)
+                    content_text = title
 
                 article_date_str = article_dt.strftime("%Y-%m-%d")
                 log_item(SOURCE, "NEW", article_date_str, title, link)
@@ -176,35 +210,30 @@ async def main():
                     "entity": ENTITY,
                     "category": CATEGORY,
                     "published_at": article_date_str,
-                    "title": sanitize_text(title, one_line=True),
+                    "title": title,
                     "url": sanitize_text(link, one_line=True),
                     "abstract": "",
-                    "content": sanitize_text(content_text, one_line=True),
+                    "content": content_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
 
-                visited_links.add(link)
-                count += 1
-
             if stop_early:
                 break
 
             try:
                 next_btn = await page.query_selector("a._next")
                 if next_btn and await next_btn.is_visible() and await next_btn.is_enabled():
-                    await next_btn.click()
-                    await page.wait_for_load_state("networkidle")
-                    await page.wait_for_timeout(5000)
+                    await click_and_wait_for_list(page, next_btn, LIST_ITEM_SELECTOR)
                 else:
                     break
             except Exception:
                 break
 
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True
+    )
     log_summary(SOURCE, len(std_rows), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
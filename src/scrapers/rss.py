@@ -5,23 +5,28 @@ Industrial-grade RSS Polling Engine
 
 import csv
 import hashlib
-import io
+import json
 import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import urlsplit
 from typing import List, Dict
 
 import feedparser
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
 from dateutil import parser as dateparser
-import PyPDF2
+import pypdfium2 as pdfium
 
 from ..utils import (
     STANDARD_FIELDS, sanitize_text, utc_now_str, write_incremental_csv, 
-    make_uid, log_item, log_summary, get_lookback_date_range,
-    GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    make_uid, log_item, log_summary, get_lookback_date_range, env_int,
+    DATA_DIR, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
 
 # ========================
@@ -96,6 +101,18 @@ RSS_SOURCES = [
     {"entity": "意大利", "entity_type": "all", "rss_type": "all", "url": "https://www.bancaditalia.it/util/index.rss.html?lingua=en"}
 ]
 
+# Feeds polled at once
+FEED_CONCURRENCY = env_int("CBDC_RSS_FEED_CONCURRENCY", 20)
+
+# Article / PDF bodies fetched at once, and at most this many from any one host
+CONTENT_CONCURRENCY = env_int("CBDC_RSS_CONTENT_CONCURRENCY", 16)
+PER_HOST_CONCURRENCY = env_int("CBDC_RSS_PER_HOST_CONCURRENCY", 4)
+
+# Conditional GET: each feed's ETag / Last-Modified from the last run, so an
+# unchanged feed answers 304 with no body. Set CBDC_RSS_CONDITIONAL_GET=0 to refetch everything.
+CONDITIONAL_GET = env_int("CBDC_RSS_CONDITIONAL_GET", 1)
+FEED_CACHE_PATH = DATA_DIR / "rss_feed_cache.json"
+
 # ========================
 # PATHS
 # ========================
@@ -104,13 +121,45 @@ RSS_SOURCES = [
 # ========================
 # UTILITIES
 # ========================
+# Dates in titles / summaries: 2024-03-05 (also / .), 05-03-2024, any year 2022-2029, 2020-2025
+_ISO_DATE_RE = re.compile(r"\b(202[2-9])[-/.](0[1-9]|1[0-2])[-/.](0[1-9]|[12]\d|3[01])\b")
+_DMY_DATE_RE = re.compile(r"\b(0[1-9]|[12]\d|3[01])[-/.](0[1-9]|1[0-2])[-/.](202[2-9])\b")
+_RECENT_YEAR_RE = re.compile(r"\b202[2-9]\b")
+_OLD_YEAR_RE = re.compile(r"\b(202[0-5])\b")
+
+# Article pages: boilerplate tags and classes, and the id / class of a likely content container
+_JUNK_TAGS = ["script","style","header","footer","nav","aside","iframe","noscript","form","button","svg","img","figcaption","table","hr","meta","link","input","select","textarea"]
+_JUNK_CLASS_RE = re.compile("disclaimer|footer|copyright|share|social|related|sidebar|advert|breadcrumb|cookies", re.I)
+_CONTENT_ID_RE = re.compile("content|article|body|text", re.I)
+_CONTENT_CLASS_RE = re.compile("content|article|body|text|speech|press", re.I)
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_MULTI_SPACE_RE = re.compile(r"\s{2,}")
+
+# Date formats the feeds actually use (RFC 822 and ISO 8601); anything else goes to dateutil
+_FEED_DATE_FORMATS = (
+    "%a, %d %b %Y %H:%M:%S %z",  # Tue, 05 Mar 2024 14:00:00 -0500
+    "%a, %d %b %Y %H:%M:%S %Z",  # Tue, 05 Mar 2024 14:00:00 GMT
+    "%Y-%m-%dT%H:%M:%S%z",       # 2024-03-05T14:00:00+00:00 / ...Z
+    "%Y-%m-%d %H:%M:%S",
+)
+
+# Entries of one feed share a handful of date strings; parse each once
+@lru_cache(maxsize=4096)
 def safe_parse_date(d):
     """
-    Parses a date string from an RSS entry using dateutil.parser.
+    Parses a date string from an RSS entry: the known feed formats via strptime,
+    then dateutil.parser for the rest.
     Returns YYYY-MM-DD HH:MM:SS or empty string.
     """
     if not d:
         return ""
+    d = d.strip()
+    for fmt in _FEED_DATE_FORMATS:
+        try:
+            return datetime.strptime(d, fmt).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            continue
     try:
         dt = dateparser.parse(d)
         return dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -130,12 +179,12 @@ def try_extract_date_from_text(text: str) -> str:
         return ""
     
     # 1. YYYY-MM-DD or YYYY/MM/DD
-    match = re.search(r"\b(202[2-9])[-/.](0[1-9]|1[0-2])[-/.](0[1-9]|[12]\d|3[01])\b", text)
+    match = _ISO_DATE_RE.search(text)
     if match:
         return f"{match.group(1)}-{match.group(2)}-{match.group(3)}"
         
     # 2. DD-MM-YYYY or DD/MM/YYYY
-    match = re.search(r"\b(0[1-9]|[12]\d|3[01])[-/.](0[1-9]|1[0-2])[-/.](202[2-9])\b", text)
+    match = _DMY_DATE_RE.search(text)
     if match:
         return f"{match.group(3)}-{match.group(2)}-{match.group(1)}"
         
@@ -144,7 +193,7 @@ def try_extract_date_from_text(text: str) -> str:
         # dateutil fuzzy parsing is powerful but can be aggressive.
         # We limit the text length or pre-filter to avoid false positives?
         # Instead, let's look for Year 202X explicitly in the text first.
-        if re.search(r"\b202[2-9]\b", text):
+        if _RECENT_YEAR_RE.search(text):
             dt = dateparser.parse(text, fuzzy=True)
             # Sanity check: Year must be in reasonable range
             if 2020 <= dt.year <= 2030:
@@ -169,7 +218,7 @@ def check_year_heuristic(text: str) -> str:
     
     # Check for older years to explicitly reject
     # We scan for 2020-2025
-    match = re.search(r"\b(202[0-5])\b", text)
+    match = _OLD_YEAR_RE.search(text)
     if match:
         return f"{match.group(1)}-01-01"
         
@@ -193,46 +242,90 @@ def html_to_text(html: str) -> str:
     if not html:
         return ""
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         return soup.get_text(" ", strip=True)
     except Exception:
         return str(html)
 
+# PDFium is not thread-safe: one document at a time per process
+_PDFIUM_LOCK = threading.Lock()
+
+# Article pages: only <body> is read, so <head>'s inline scripts, styles and
+# meta tags are never built into the tree
+BODY_STRAINER = SoupStrainer("body")
+
+def pdf_to_text(data: bytes) -> str:
+    """Text of every page, blank-line separated (PDFium; pages and document freed as it goes)."""
+    with _PDFIUM_LOCK:
+        return _pdf_to_text_unlocked(data)
+
+def _pdf_to_text_unlocked(data: bytes) -> str:
+    pdf = pdfium.PdfDocument(data)
+    try:
+        pages = []
+        for i in range(len(pdf)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                t = textpage.get_text_range()
+            finally:
+                textpage.close()
+                page.close()
+            if t:
+                pages.append(t.replace("\r\n", "\n"))
+        return "\n\n".join(pages)
+    finally:
+        pdf.close()
+
+_session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Keep-alive session shared by the content fetch threads, created on first call.
+
+    One connection pool per host (up to CONTENT_CONCURRENCY hosts), each as
+    large as PER_HOST_CONCURRENCY, the most requests fetch_contents sends to a host at once.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=max(CONTENT_CONCURRENCY, 1), pool_maxsize=max(PER_HOST_CONCURRENCY, 1)
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"User-Agent": "Mozilla/5.0 (RSSBot/1.0)"})
+            _session = session
+    return _session
+
 def extract_content(link, content_type):
     if not link:
         return ""
 
     try:
-        headers = {"User-Agent": "Mozilla/5.0 (RSSBot/1.0)"}
-        r = requests.get(link, headers=headers, timeout=40)
+        r = get_session().get(link, timeout=40)
         r.raise_for_status()
 
         # ---- PDF ----
         if content_type == "pdf":
-            reader = PyPDF2.PdfReader(io.BytesIO(r.content))
-            pages = []
-            for p in reader.pages:
-                t = p.extract_text()
-                if t:
-                    pages.append(t)
-            text = "\n\n".join(pages)
-            return re.sub(r"\\n\\s*\\n+", "\\n\\n", text.strip())
+            text = pdf_to_text(r.content)
+            return _BLANK_LINES_RE.sub("\n\n", text.strip())
 
         # ---- HTML ----
-        soup = BeautifulSoup(r.text, "html.parser")
-        for tag in ["script","style","header","footer","nav","aside","iframe","noscript","form","button","svg","img","figcaption","table","hr","meta","link","input","select","textarea"]:
-            for e in soup.find_all(tag):
-                e.decompose()
+        soup = BeautifulSoup(r.content, "lxml", parse_only=BODY_STRAINER)
+        # One tree walk for all the tags, one for all the classes
+        for e in soup.find_all(_JUNK_TAGS):
+            e.decompose()
 
-        for cls in ["disclaimer","footer","copyright","share","social","related","sidebar","advert","breadcrumb","cookies"]:
-            for e in soup.find_all(class_=re.compile(cls, re.I)):
-                e.decompose()
+        for e in soup.find_all(class_=_JUNK_CLASS_RE):
+            e.decompose()
 
         main = (
             soup.find("main") or
             soup.find("article") or
-            soup.find("div", id=re.compile("content|article|body|text", re.I)) or
-            soup.find("div", class_=re.compile("content|article|body|text|speech|press", re.I)) or
+            soup.find("div", id=_CONTENT_ID_RE) or
+            soup.find("div", class_=_CONTENT_CLASS_RE) or
             soup.body
         )
 
@@ -246,15 +339,33 @@ def extract_content(link, content_type):
                 blocks.append(t)
 
         text = "\n\n".join(blocks)
-        text = re.sub(r"\\n\\s*\\n+", "\\n\\n", text)
-        text = re.sub(r"\\s{2,}", " ", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
+        text = _MULTI_SPACE_RE.sub(" ", text)
         return text.strip()
 
     except Exception as ex:
         return ""
 
-def parse_rss(src, min_date_str):
-    feed = feedparser.parse(src["url"])
+def load_feed_cache():
+    """{feed url: {"etag": ..., "modified": ...}} from the last run; {} if missing or unreadable."""
+    if not CONDITIONAL_GET:
+        return {}
+    try:
+        with FEED_CACHE_PATH.open("r", encoding="utf-8") as f:
+            cache = json.load(f)
+        return cache if isinstance(cache, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_feed_cache(cache):
+    tmp = FEED_CACHE_PATH.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+    tmp.replace(FEED_CACHE_PATH)
+
+def parse_rss(src, min_date_str, crawl_ts, feed=None):
+    if feed is None:
+        feed = feedparser.parse(src["url"])
 
     base = ""
     if src["entity"] == "土耳其":
@@ -301,54 +412,107 @@ def parse_rss(src, min_date_str):
             "summary": e.get("summary", ""),
             "content_type": content_type_from_link(link),
             "content": "",
-            "crawl_time": utc_now_str()
+            "crawl_time": crawl_ts
         })
     return items
 
+def poll_feeds(min_date_str, crawl_ts, feed_cache):
+    """parse_rss for every source, FEED_CONCURRENCY at a time.
+
+    Feeds are fetched conditionally on their `feed_cache` validators; one that
+    answers 304 yields no items. Returns (src, items, error, validators) per
+    source in RSS_SOURCES order: a failed feed has items None and the exception
+    as error, and validators is the feed's new {"etag", "modified"} (or None).
+    """
+    def _poll(src):
+        try:
+            cached = feed_cache.get(src["url"]) or {}
+            feed = feedparser.parse(src["url"], etag=cached.get("etag"), modified=cached.get("modified"))
+            if feed.get("status") == 304:
+                return src, [], None, cached
+            validators = {k: feed[k] for k in ("etag", "modified") if feed.get(k)}
+            return src, parse_rss(src, min_date_str, crawl_ts, feed=feed), None, validators or None
+        except Exception as e:
+            return src, None, e, None
+
+    with ThreadPoolExecutor(max_workers=max(FEED_CONCURRENCY, 1)) as pool:
+        return list(pool.map(_poll, RSS_SOURCES))
+
+def fetch_contents(items):
+    """extract_content for every item, concurrently; results in item order.
+
+    Items from many feeds share a few hosts (federalreserve.gov, bankofcanada.ca, ...),
+    so besides the pool size each host gets at most PER_HOST_CONCURRENCY requests.
+    """
+    if not items:
+        return []
+    host_slots = {
+        urlsplit(item["link"]).netloc: threading.BoundedSemaphore(max(PER_HOST_CONCURRENCY, 1))
+        for item in items
+    }
+
+    def _one(item):
+        with host_slots[urlsplit(item["link"]).netloc]:
+            return extract_content(item["link"], item["content_type"])
+
+    with ThreadPoolExecutor(max_workers=min(max(CONTENT_CONCURRENCY, 1), len(items))) as pool:
+        return list(pool.map(_one, items))
+
 def main():
     # 1. Determine Date Range
     start_dt, end_dt = get_lookback_date_range()
     min_date_str = start_dt.strftime("%Y-%m-%d")
+    crawl_ts = utc_now_str()
     
     std_rows = []
     total_new = 0
 
-    for src in RSS_SOURCES:
-        try:
-            items = parse_rss(src, min_date_str)
-        except Exception as e:
-            print(f"[WARN] RSS failed: {src['url']} | {e}")
+    feed_cache = load_feed_cache()
+    new_feed_cache = {}
+
+    # Feeds are fetched concurrently; their items are handled in source order
+    pending = []
+    for src, items, error, validators in poll_feeds(min_date_str, crawl_ts, feed_cache):
+        if validators:
+            new_feed_cache[src["url"]] = validators
+        if error is not None:
+            print(f"[WARN] RSS failed: {src['url']} | {error}")
             continue
+        pending.extend(items)
 
-        for item in items:
-            uid = make_uid("rss", item["link"])
-            
-            # Extract content
-            item["content"] = extract_content(item["link"], item["content_type"])
-            
-            # Log
-            status = "NEW" # We assume new for now, write_incremental_csv handles dedupe
-            log_item("RSS", status, item["published"], item["title"], item["link"])
-
-            std_rows.append(
-                {
-                    "uid": uid,
-                    "source": "rss",
-                    "entity": sanitize_text(item.get("entity", ""), one_line=True),
-                    "category": sanitize_text(item.get("rss_type") or item.get("entity_type") or "", one_line=True),
-                    "published_at": sanitize_text(item.get("published", ""), one_line=True),
-                    "title": sanitize_text(item.get("title", ""), one_line=True),
-                    "url": sanitize_text(item.get("link", ""), one_line=True),
-                    "abstract": sanitize_text(html_to_text(item.get("summary", "")), one_line=True),
-                    "content": sanitize_text(item.get("content", ""), one_line=True),
-                    "content_type": sanitize_text(item.get("content_type", ""), one_line=True),
-                    "crawl_time": sanitize_text(item.get("crawl_time", "") or utc_now_str(), one_line=True),
-                }
-            )
+    # Extract content
+    contents = fetch_contents(pending)
+    for item, content in zip(pending, contents):
+        uid = make_uid("rss", item["link"])
+        item["content"] = content
+
+        # Log
+        status = "NEW" # We assume new for now, write_incremental_csv handles dedupe
+        log_item("RSS", status, item["published"], item["title"], item["link"])
+
+        std_rows.append(
+            {
+                "uid": uid,
+                "source": "rss",
+                "entity": sanitize_text(item.get("entity", ""), one_line=True),
+                "category": sanitize_text(item.get("rss_type") or item.get("entity_type") or "", one_line=True),
+                "published_at": sanitize_text(item.get("published", ""), one_line=True),
+                "title": sanitize_text(item.get("title", ""), one_line=True),
+                "url": sanitize_text(item.get("link", ""), one_line=True),
+                "abstract": sanitize_text(html_to_text(item.get("summary", "")), one_line=True),
+                "content": sanitize_text(item.get("content", ""), one_line=True),
+                "content_type": sanitize_text(item.get("content_type", ""), one_line=True),
+                "crawl_time": sanitize_text(item.get("crawl_time", "") or crawl_ts, one_line=True),
+            }
+        )
 
     # Write
     new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=std_rows, append_new=True)
     log_summary("RSS", len(std_rows), new_count)
 
+    # Only once this run's items are saved: a 304 next time must not hide unsaved items
+    if CONDITIONAL_GET:
+        save_feed_cache(new_feed_cache)
+
 if __name__ == "__main__":
     main()
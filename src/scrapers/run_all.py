@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Run several scrapers concurrently in one process.
+
+Async Playwright scrapers share a single Chromium; the blocking ones (sync
+Playwright, requests) each run on a worker thread.
+
+    python -m src.scrapers                      # every scraper
+    python -m src.scrapers.run_all bcra bdf     # a subset
+"""
+import argparse
+import asyncio
+import importlib
+import sys
+import time
+
+from ..utils import env_int
+
+# Scrapers built on playwright.async_api / src.scrapers._browser
+ASYNC_SCRAPERS = ["weiyang", "mas", "bi", "sama", "boj", "bcra", "bahamas", "bdf", "mnb", "cbr", "ecb", "imf"]
+
+# Blocking scrapers; their main() is run via asyncio.to_thread
+SYNC_SCRAPERS = ["rss", "tcmb"]
+
+ALL_SCRAPERS = ASYNC_SCRAPERS + SYNC_SCRAPERS
+
+# How many of them crawl at once inside this process (CBDC_JOB_CONCURRENCY
+# separately caps the job subprocesses src.main starts)
+SCRAPER_CONCURRENCY = env_int("CBDC_SCRAPER_CONCURRENCY", 4)
+
+async def run_all(names):
+    """Run the named scrapers; returns the names of those that raised."""
+    # Imported here so `src.main` can read the lists above without loading Playwright
+    from ._browser import close_browser
+
+    sem = asyncio.Semaphore(max(SCRAPER_CONCURRENCY, 1))
+    failed = []
+
+    async def _one(name):
+        async with sem:
+            start_time = time.time()
+            try:
+                module = importlib.import_module(f"{__package__}.{name}")
+                if name in SYNC_SCRAPERS:
+                    await asyncio.to_thread(module.main)
+                else:
+                    await module.main()
+                print(f"✅ Scraper '{name}' completed in {time.time() - start_time:.2f}s")
+            except Exception as e:
+                failed.append(name)
+                print(f"❌ Scraper '{name}' error: {e}")
+
+    try:
+        await asyncio.gather(*(_one(name) for name in names))
+    finally:
+        await close_browser()
+    return failed
+
+def main():
+    parser = argparse.ArgumentParser(description="Run scrapers concurrently in one process")
+    parser.add_argument("names", nargs="*", metavar="name",
+                        help=f"scrapers to run (default: all of {', '.join(ALL_SCRAPERS)})")
+    args = parser.parse_args()
+
+    unknown = [n for n in args.names if n not in ALL_SCRAPERS]
+    if unknown:
+        parser.error(f"unknown scraper: {', '.join(unknown)}")
+    failed = asyncio.run(run_all(args.names or ALL_SCRAPERS))
+    if failed:
+        # Non-zero exit so src.main reports the run_all job as failed
+        sys.exit(f"❌ {len(failed)} scraper(s) failed: {', '.join(failed)}")
+
+if __name__ == "__main__":
+    main()
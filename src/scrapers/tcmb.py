@@ -8,8 +8,9 @@ from playwright.sync_api import sync_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
 )
+from ._browser import CHROMIUM_ARGS, block_heavy_resources_sync
 
 # ================= 配置区 =================
 LIST_BASE_URL = "https://www.tcmb.gov.tr/wps/wcm/connect/EN/TCMB+EN/Main+Menu/Announcements/Press+Releases/"
@@ -21,26 +22,39 @@ CATEGORY = "press_releases"
 
 # ==========================================
 
+# [container found?, innerText of each `blocks` match in it, or of every <p> on the page if it's missing]
+_DETAIL_TEXTS_JS = """([container, blocks]) => {
+    const root = document.querySelector(container);
+    const els = root ? root.querySelectorAll(blocks) : document.querySelectorAll('p');
+    return [!!root, Array.from(els, e => e.innerText)];
+}"""
+
+# [title, href, date] of every list entry, read in one round trip
+_LIST_ROWS_JS = """els => els.map(n => {
+    const a = n.querySelector("a.collection-title");
+    const tag = n.querySelector("div.collection-tag");
+    return [a ? a.innerText.trim() : "", a?.getAttribute("href") || "", tag ? tag.innerText.trim() : ""];
+})"""
+
 def clean_text_to_single_line(text):
     if not text:
         return ""
-    return " ".join(str(text).replace("\n", " ").replace("\r", " ").replace("\t", " ").split())
+    # split() drops the same whitespace \s matches; no regex pass
+    return " ".join(str(text).split())
 
 def get_article_content(browser, url):
     if not url or not url.startswith("http"):
         return ""
     context = browser.new_context()
+    context.route("**/*", block_heavy_resources_sync)
     page = context.new_page()
     full_text = ""
     try:
         page.goto(url, timeout=60000, wait_until="domcontentloaded")
         page.wait_for_timeout(2000)
-        content_selector = page.locator("div.tcmb-content.type-prg").first
-        if content_selector.count() > 0:
-            paragraphs = content_selector.locator("p, h2, h3").all_inner_texts()
-            full_text = " ".join(paragraphs)
-        else:
-            full_text = " ".join(page.locator("p").all_inner_texts())
+        # Container check and texts in one round trip
+        _, texts = page.evaluate(_DETAIL_TEXTS_JS, ["div.tcmb-content.type-prg", "p, h2, h3"])
+        full_text = " ".join(texts)
     except Exception:
         pass
     finally:
@@ -51,49 +65,43 @@ def get_article_content(browser, url):
 def extract_list_page(page):
     page.wait_for_selector(".block-collection-box", timeout=30000)
     page.wait_for_timeout(1500)
-    items = page.locator("div.block-collection-box").all()
+    rows = page.eval_on_selector_all("div.block-collection-box", _LIST_ROWS_JS)
     results = []
-    for item in items:
-        try:
-            title_elem = item.locator("a.collection-title").first
-            title = title_elem.inner_text().strip() if title_elem.count() > 0 else ""
-            link = title_elem.get_attribute("href") if title_elem.count() > 0 else ""
-            if link and not link.startswith("http"):
-                link = "https://www.tcmb.gov.tr" + link
-            date_elem = item.locator("div.collection-tag").first
-            date_str = date_elem.inner_text().strip() if date_elem.count() > 0 else ""
-            date_obj = None
-            try:
-                if date_str:
-                    for fmt in ["%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%d-%m-%Y"]:
-                        try:
-                            date_obj = datetime.strptime(date_str, fmt)
-                            break
-                        except ValueError:
-                            continue
-            except Exception:
-                date_obj = None
-            if title and link and date_obj:
-                results.append({
-                    "date_obj": date_obj,
-                    "date_str": date_obj.strftime("%Y-%m-%d"),
-                    "link": link,
-                    "title": title,
-                })
-        except Exception:
-            continue
+    for title, link, date_str in rows:
+        if link and not link.startswith("http"):
+            link = "https://www.tcmb.gov.tr" + link
+        date_obj = None
+        if date_str:
+            for fmt in ["%d/%m/%Y", "%d.%m.%Y", "%Y-%m-%d", "%d-%m-%Y"]:
+                try:
+                    date_obj = datetime.strptime(date_str, fmt)
+                    break
+                except ValueError:
+                    continue
+        if title and link and date_obj:
+            results.append({
+                "date_obj": date_obj,
+                "date_str": date_obj.strftime("%Y-%m-%d"),
+                "link": link,
+                "title": title,
+            })
     results.sort(key=lambda x: x["date_obj"], reverse=True)
     return results
 
 def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    # List dates are naive
+    min_date = start_dt.replace(tzinfo=None)
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     
     std_rows = []
     visited_links = set()
 
     with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
+        browser = p.chromium.launch(headless=True, args=CHROMIUM_ARGS)
         page = browser.new_page()
+        page.route("**/*", block_heavy_resources_sync)
         page.goto(LIST_BASE_URL, wait_until="domcontentloaded")
         page.wait_for_timeout(3000)
 
@@ -112,14 +120,20 @@ def main():
 
                 dt = item["date_obj"]
                 # STRICT DATE CHECK
-                if dt and dt < start_dt:
+                if dt and dt < min_date:
                     keep_scraping = False
                     break
 
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    continue
+
                 title = item["title"]
                 full_content = get_article_content(browser, link)
                 
                 log_item(SOURCE, "NEW", item["date_str"], title, link)
+                content = sanitize_text(full_content, one_line=True)
 
                 std_rows.append({
                     "uid": make_uid(SOURCE, link),
@@ -129,10 +143,10 @@ def main():
                     "published_at": item["date_str"],
                     "title": sanitize_text(title, one_line=True),
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text((full_content[:300] if full_content else ""), one_line=True),
-                    "content": sanitize_text(full_content, one_line=True),
+                    "abstract": content[:300].rstrip(),
+                    "content": content,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 })
                 visited_links.add(link)
 
@@ -6,11 +6,14 @@ from datetime import datetime, timedelta
 from pathlib import Path
 
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright
 
 from ..utils import (
     STANDARD_FIELDS, make_uid, sanitize_text, utc_now_str, write_incremental_csv,
-    log_item, log_summary, get_lookback_date_range, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+    log_item, log_summary, get_lookback_date_range, load_seen_uids, GLOBAL_ALL_CSV, GLOBAL_NEW_CSV
+)
+from ._browser import (
+    DetailPagePool, class_strainer, click_and_wait_for_list, list_item_soups,
+    run_scraper, shared_context, wait_for_content
 )
 
 # ================= 配置区 =================
@@ -25,37 +28,54 @@ SOURCE = "weiyang"
 ENTITY = "未央"
 CATEGORY = "international"
 
+# 列表条目（等待并提取列表）/ 正文容器（等待详情页就绪）
+LIST_ITEM_SELECTOR = ".wyt-tag-post"
+DETAIL_SELECTOR = ".wyt-single-output"
+
 # ==========================================
 
-async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES):
+# Detail pages: parse only the article body and the date line
+DETAIL_STRAINER = class_strainer("wyt-single-output", "uk-text-small")
+
+# Tags whose text makes up the article
+DETAIL_TEXT_TAGS = frozenset({"p", "h2", "h3"})
+
+async def safe_goto(page, url, timeout=TIMEOUT, retries=RETRY_TIMES, wait_selector=None):
     for i in range(retries):
         try:
             # print(f"打开页面：{url}（尝试 {i + 1}/{retries}）")
             await page.goto(url, timeout=timeout, wait_until="networkidle")
-            await page.wait_for_timeout(1500)
+            if wait_selector:
+                await wait_for_content(page, wait_selector)
             return True
         except Exception as e:
             # print(f"⚠️ 第 {i + 1} 次尝试失败：{e}")
             await asyncio.sleep(3)
     return False
 
+_DAYS_AGO_RE = re.compile(r"(\d+)\s*天前")
+_FULL_DATE_RE = re.compile(r"(\d{4})[./-](\d{1,2})[./-](\d{1,2})")
+_MONTH_DAY_RE = re.compile(r"(\d{1,2})[./-](\d{1,2})$")
+# Reading-time boilerplate at the top of articles
+_READING_META_RE = re.compile(r"(本文共\d+字|预计阅读时间)")
+
 def parse_date_text(date_raw: str) -> str:
     now = datetime.now()
     if not date_raw:
         return now.strftime("%Y-%m-%d")
     date_raw = date_raw.strip()
 
-    m = re.search(r"(\d+)\s*天前", date_raw)
+    m = _DAYS_AGO_RE.search(date_raw)
     if m:
         d = now - timedelta(days=int(m.group(1)))
         return d.strftime("%Y-%m-%d")
 
-    m = re.search(r"(\d{4})[./-](\d{1,2})[./-](\d{1,2})", date_raw)
+    m = _FULL_DATE_RE.search(date_raw)
     if m:
         y, mm, dd = m.groups()
         return f"{int(y):04d}-{int(mm):02d}-{int(dd):02d}"
 
-    m = re.search(r"(\d{1,2})[./-](\d{1,2})$", date_raw)
+    m = _MONTH_DAY_RE.search(date_raw)
     if m:
         mm, dd = m.groups()
         return f"{now.year:04d}-{int(mm):02d}-{int(dd):02d}"
@@ -66,10 +86,10 @@ async def fetch_detail_content(page, link: str):
     for attempt in range(RETRY_TIMES):
         try:
             await page.goto(link, timeout=TIMEOUT, wait_until="networkidle")
-            await page.wait_for_timeout(1500)
+            await wait_for_content(page, DETAIL_SELECTOR)
 
             html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
+            soup = BeautifulSoup(html, "lxml", parse_only=DETAIL_STRAINER)
 
             date_tag = soup.select_one(".uk-margin-remove.uk-text-small span")
             date_text = date_tag.get_text(strip=True) if date_tag else ""
@@ -82,9 +102,9 @@ async def fetch_detail_content(page, link: str):
                     bad.decompose()
 
                 paragraphs = []
-                for p in content_div.find_all(["p", "h2", "h3"]):
+                for p in content_div.find_all(DETAIL_TEXT_TAGS):
                     t = p.get_text(strip=True)
-                    if t and not re.match(r"(本文共\d+字|预计阅读时间)", t):
+                    if t and not _READING_META_RE.match(t):
                         paragraphs.append(t)
                 content_text = "\n".join(paragraphs)
 
@@ -96,30 +116,30 @@ async def fetch_detail_content(page, link: str):
 
 async def main():
     start_dt, end_dt = get_lookback_date_range()
+    crawl_ts = utc_now_str()
+    seen_uids = load_seen_uids(GLOBAL_ALL_CSV)
     min_date_str = start_dt.strftime("%Y-%m-%d")
     
     results = []
     visited_links = set()
     stop_early = False
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context(viewport={"width": 1920, "height": 1080})
+    async with shared_context(viewport={"width": 1920, "height": 1080}) as context:
         page = await context.new_page()
+        detail_pages = DetailPagePool(context)
 
-        if not await safe_goto(page, LIST_URL):
+        if not await safe_goto(page, LIST_URL, wait_selector=LIST_ITEM_SELECTOR):
             print(f"[{SOURCE}] List page failed.")
             return
 
         count = 0
         while count < MAX_ARTICLES and not stop_early:
-            html = await page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            posts = soup.select(".wyt-tag-post")
+            posts = await list_item_soups(page, LIST_ITEM_SELECTOR)
             if not posts:
                 break
 
             new_added = 0
+            pending = []
             for post in posts:
                 if count >= MAX_ARTICLES or stop_early:
                     break
@@ -148,10 +168,23 @@ async def main():
                 abs_tag = post.select_one(".wyt-tag-post-info-brief")
                 list_abstract = abs_tag.get_text(" ", strip=True) if abs_tag else ""
 
-                detail_page = await context.new_page()
-                article_date_detail, content_text = await fetch_detail_content(detail_page, link)
-                await detail_page.close()
+                # Already in the history CSV: no detail fetch needed
+                if make_uid(SOURCE, link) in seen_uids:
+                    visited_links.add(link)
+                    new_added += 1
+                    continue
+
+                pending.append((article_date_list, title, link, list_abstract))
+                visited_links.add(link)
+                count += 1
+                new_added += 1
 
+            # Detail pages for this list page, fetched concurrently (results in list order)
+            contents = await detail_pages.fetch_all(fetch_detail_content, [link for _, _, link, _ in pending])
+            for (article_date_list, title, link, list_abstract), (article_date_detail, content_text) in zip(pending, contents):
+                # content_text is already sanitized by fetch_detail_content
+                title = sanitize_text(title, one_line=True)
+                list_abstract = sanitize_text(list_abstract, one_line=True)
                 final_date = article_date_detail or article_date_list
                 if final_date < min_date_str:
                     # If detail date is older, skip and stop if strictly ordered
@@ -159,27 +192,24 @@ async def main():
                     pass
 
                 if not content_text:
-                    content_text = sanitize_text(list_abstract, one_line=True)
+                    content_text = list_abstract
 
                 row = {
                     "uid": make_uid(SOURCE, link),
                     "source": SOURCE,
                     "entity": ENTITY,
                     "category": CATEGORY,
-                    "published_at": sanitize_text(final_date, one_line=True),
-                    "title": sanitize_text(title, one_line=True),
+                    "published_at": final_date,
+                    "title": title,
                     "url": sanitize_text(link, one_line=True),
-                    "abstract": sanitize_text(list_abstract, one_line=True),
-                    "content": sanitize_text(content_text, one_line=True),
+                    "abstract": list_abstract,
+                    "content": content_text,
                     "content_type": "html",
-                    "crawl_time": utc_now_str(),
+                    "crawl_time": crawl_ts,
                 }
 
                 results.append(row)
-                visited_links.add(link)
-                count += 1
-                new_added += 1
-                
+
                 log_item(SOURCE, "NEW", final_date, title, link)
 
             if stop_early or new_added == 0:
@@ -188,17 +218,16 @@ async def main():
             try:
                 load_more = await page.query_selector("a.wyt-loadmore")
                 if load_more and await load_more.is_visible():
-                    await load_more.click()
-                    await page.wait_for_timeout(3500)
+                    await click_and_wait_for_list(page, load_more, LIST_ITEM_SELECTOR)
                 else:
                     break
             except Exception:
                 break
 
-        await browser.close()
-
-    new_count = write_incremental_csv(all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=results, append_new=True)
+    new_count = await asyncio.to_thread(
+        write_incremental_csv, all_csv=GLOBAL_ALL_CSV, new_csv=GLOBAL_NEW_CSV, rows=results, append_new=True
+    )
     log_summary(SOURCE, len(results), new_count)
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_scraper(main)
@@ -1,4 +1,4 @@
-import concurrent.futures
+import asyncio
 import json
 import re
 from typing import Dict, Optional, Tuple, Any
@@ -52,6 +52,10 @@ class RelevanceService:
         return name, parsed, True
 
     def assess_relevance(self, title: str, abstract: str, content: str) -> Dict[str, Any]:
+        """Synchronous wrapper around assess_relevance_async."""
+        return asyncio.run(self.assess_relevance_async(title, abstract, content))
+
+    async def assess_relevance_async(self, title: str, abstract: str, content: str) -> Dict[str, Any]:
         """
         Dual-path analysis.
         Returns dict with keys: 
@@ -98,21 +102,11 @@ class RelevanceService:
         }}
         """
 
-        # 3. Dual Call
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            future_zai = executor.submit(self._call_model, self.zai, prompt, "Z.AI")
-            future_or = executor.submit(self._call_model, self.openrouter, prompt, "OpenRouter")
-            
-            results = {}
-            for future in concurrent.futures.as_completed([future_zai, future_or]):
-                name, res, success = future.result()
-                results[name] = {"data": res, "success": success}
-
-        zai_res = results.get("Z.AI", {}).get("data")
-        zai_success = results.get("Z.AI", {}).get("success", False)
-        
-        or_res = results.get("OpenRouter", {}).get("data")
-        or_success = results.get("OpenRouter", {}).get("success", False)
+        # 3. Dual Call (both providers in flight at once; wall time is max(zai, or))
+        (_, zai_res, zai_success), (_, or_res, or_success) = await asyncio.gather(
+            asyncio.to_thread(self._call_model, self.zai, prompt, "Z.AI"),
+            asyncio.to_thread(self._call_model, self.openrouter, prompt, "OpenRouter"),
+        )
         
         # 4. Detailed Status Construction
         details = {}
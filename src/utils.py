@@ -11,13 +11,16 @@ Goals:
 from __future__ import annotations
 
 import csv
+import errno
 import hashlib
 import os
 import re
 import sys
+from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Sequence, Set, Tuple
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 # ==========================================
 # Standard Fields Definition
@@ -70,34 +73,67 @@ def get_lookback_date_range() -> Tuple[datetime, datetime]:
     # User requested: "current day + previous day" (2 days total)
     return yesterday_start, now
 
+# English month names and abbreviations (lowercase) -> month number
+EN_MONTHS: Dict[str, int] = {
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11, "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7,
+    "aug": 8, "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_DAY_MONTH_YEAR_RE = re.compile(r"(\d{1,2})\s+([A-Za-z]+)\.?,?\s+(\d{4})")
+
+def parse_day_month_year(text: str) -> Optional[datetime]:
+    """
+    Parse the first "5 March 2024" / "5 Mar 2024" in `text` into a naive datetime.
+    Table lookup instead of strptime/dateutil; returns None if nothing matches.
+    """
+    m = _DAY_MONTH_YEAR_RE.search(text or "")
+    if not m:
+        return None
+    month = EN_MONTHS.get(m.group(2).lower())
+    if not month:
+        return None
+    try:
+        return datetime(int(m.group(3)), month, int(m.group(1)))
+    except ValueError:
+        return None
+
 # ==========================================
 # Text & ID Helpers
 # ==========================================
 
+@lru_cache(maxsize=4096)
 def make_uid(source: str, url: str) -> str:
-    """Generate a consistent UID based on source and URL."""
+    """Generate a consistent UID based on source and URL (cached: each link is hashed more than once per run)."""
     raw = f"{source}|{url}".encode("utf-8")
     return hashlib.sha256(raw).hexdigest()
 
+_ZERO_WIDTH_RE = re.compile(r"[\u200b\u200c\u200d\u2028\u2029]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
 def sanitize_text(text: object, *, one_line: bool = True) -> str:
     """Clean and normalize text content."""
     if text is None:
         return ""
     s = str(text)
     # Remove zero-width and similar unicode controls
-    s = re.sub(r"[\u200b\u200c\u200d\u2028\u2029]+", " ", s)
+    s = _ZERO_WIDTH_RE.sub(" ", s)
     if one_line:
-        s = re.sub(r"[\r\n\t]+", " ", s)
-        s = re.sub(r"\s+", " ", s).strip()
+        # split() breaks on \r\n\t too, so one pass collapses line breaks and strips
+        s = " ".join(s.split())
     else:
         s = s.replace("\r\n", "\n").replace("\r", "\n")
-        s = re.sub(r"\n\s*\n+", "\n\n", s).strip()
+        s = _BLANK_LINES_RE.sub("\n\n", s).strip()
     return s
 
 # ==========================================
 # CSV & File Helpers
 # ==========================================
 
+# Write buffer for the CSV outputs; one batch usually fits in a single flush
+CSV_WRITE_BUFFER = 1 << 17
+
 def ensure_csv_field_size_limit() -> None:
     """Increase per-field CSV limit to support long `content` fields."""
     max_size = getattr(sys, "maxsize", 2**31 - 1)
@@ -119,40 +155,103 @@ def _read_header(csv_path: Path) -> Optional[List[str]]:
         except StopIteration:
             return None
 
-def load_existing_keys(csv_path: Path) -> Tuple[Set[str], Set[str]]:
-    """Return (uids, urls) from an existing CSV."""
-    ensure_csv_field_size_limit()
-    if not csv_path.exists() or csv_path.stat().st_size == 0:
-        return set(), set()
+# Parsed history keys per CSV path, with the (mtime_ns, size) they were read at
+_history_keys_cache: Dict[str, Tuple[Tuple[int, int], FrozenSet[str], FrozenSet[str]]] = {}
+
+def _history_keys(csv_path: Path) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(uids, urls) of a CSV, parsed once per file version.
 
+    Every scraper in a run reads the same history CSV; it is only re-parsed
+    after a write changes its mtime or size.
+    """
+    try:
+        st = csv_path.stat()
+    except OSError:
+        return frozenset(), frozenset()
+    if st.st_size == 0:
+        return frozenset(), frozenset()
+    key = str(csv_path.resolve())
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _history_keys_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return cached[1], cached[2]
+
+    ensure_csv_field_size_limit()
+    uids: Set[str] = set()
+    urls: Set[str] = set()
     with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
-        reader = csv.DictReader(f)
-        if not reader.fieldnames:
-            return set(), set()
-
-        fields = set(reader.fieldnames)
-        has_uid = "uid" in fields
-        url_field = "url" if "url" in fields else ("link" if "link" in fields else None)
-
-        uids: Set[str] = set()
-        urls: Set[str] = set()
-
-        for row in reader:
-            if has_uid:
-                uid = (row.get("uid") or "").strip()
-                if uid:
-                    uids.add(uid)
-            if url_field:
-                url = (row.get(url_field) or "").strip()
-                if url:
-                    urls.add(url)
-        return uids, urls
+        # Plain reader + column indexes: no per-row dict for the (wide) history rows
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header:
+            uid_idx = header.index("uid") if "uid" in header else None
+            url_field = "url" if "url" in header else ("link" if "link" in header else None)
+            url_idx = header.index(url_field) if url_field else None
+
+            for row in reader:
+                if uid_idx is not None and uid_idx < len(row):
+                    uid = row[uid_idx].strip()
+                    if uid:
+                        uids.add(uid)
+                if url_idx is not None and url_idx < len(row):
+                    url = row[url_idx].strip()
+                    if url:
+                        urls.add(url)
+
+    result = (frozenset(uids), frozenset(urls))
+    _history_keys_cache[key] = (version, *result)
+    return result
+
+def load_existing_keys(csv_path: Path) -> Tuple[Set[str], Set[str]]:
+    """Return (uids, urls) from an existing CSV, as fresh sets the caller may extend."""
+    uids, urls = _history_keys(Path(csv_path))
+    return set(uids), set(urls)
+
+def load_seen_uids(csv_path: Path = GLOBAL_ALL_CSV) -> FrozenSet[str]:
+    """UIDs already in the history CSV; scrapers skip detail fetches for these.
+
+    New rows reach the history via write_incremental_csv, so the next run sees them.
+    """
+    return _history_keys(Path(csv_path))[0]
+
+@contextmanager
+def csv_write_lock(csv_path: Path) -> Iterator[None]:
+    """
+    Exclusive cross-process lock around a read-modify-write of a shared CSV.
+    Scraper jobs run concurrently and all append to the global CSVs.
+    """
+    lock_path = Path(csv_path).with_suffix(".lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a+b") as fh:
+        if os.name == "nt":
+            import msvcrt
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError as e:
+                    # LK_LOCK gives up with EDEADLK after ~10s of contention; keep waiting then,
+                    # but a bad handle or denied access won't go away by retrying
+                    if e.errno != errno.EDEADLK:
+                        raise
+        else:
+            import fcntl
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
 
 def write_incremental_csv(
     *,
     all_csv: Path,
     new_csv: Path,
-    rows: List[Dict[str, str]],
+    rows: Iterable[Dict[str, str]],
     fields: Sequence[str] = STANDARD_FIELDS,
     dedupe_by: str = "uid",
     append_new: bool = False,
@@ -163,9 +262,40 @@ def write_incremental_csv(
         If append_new=False (default): overwritten each run with ONLY the new items from this run.
         If append_new=True: appended with the new items (useful when multiple scrapers write to same new_csv).
     - all_csv: appended with deduping (historical record)
+    - rows: any iterable of row dicts (a list or a generator); consumed once,
+      and only the rows that survive dedupe are kept in memory
     
+    Holds csv_write_lock(all_csv) for the whole update so concurrent scrapers
+    don't interleave their copy/replace steps.
     Returns number of NEW rows written.
     """
+    with csv_write_lock(all_csv):
+        return _write_incremental_csv_unlocked(
+            all_csv=all_csv,
+            new_csv=new_csv,
+            rows=rows,
+            fields=fields,
+            dedupe_by=dedupe_by,
+            append_new=append_new,
+        )
+
+# Columns with a handful of distinct values per run (same source/entity/crawl_time on every row)
+_LABEL_FIELDS = frozenset({"source", "entity", "category", "published_at", "content_type", "crawl_time"})
+
+@lru_cache(maxsize=256)
+def _sanitize_label(value: str) -> str:
+    return sanitize_text(value, one_line=True)
+
+def _write_incremental_csv_unlocked(
+    *,
+    all_csv: Path,
+    new_csv: Path,
+    rows: Iterable[Dict[str, str]],
+    fields: Sequence[str] = STANDARD_FIELDS,
+    dedupe_by: str = "uid",
+    append_new: bool = False,
+) -> int:
+    """write_incremental_csv body; the caller holds csv_write_lock(all_csv)."""
     import tempfile
     import shutil
     
@@ -182,26 +312,35 @@ def write_incremental_csv(
 
     # 2. Filter rows
     filtered: List[Dict[str, str]] = []
+    has_uid = "uid" in fields
+    has_url = "url" in fields
     for r in rows:
+        # Dedupe on the key fields first, so dropped rows never get their content sanitized
+        uid = sanitize_text(r.get("uid", ""), one_line=True) if has_uid else ""
+        url = sanitize_text(r.get("url", ""), one_line=True) if has_url else ""
+        if dedupe_by == "uid" and uid and uid in existing_uids:
+            continue
+        if dedupe_by == "url" and url and url in existing_urls:
+            continue
+
         # Ensure all standard fields exist, default to empty string
         clean_row = {}
         for k in fields:
+            if k == "uid":
+                clean_row[k] = uid
+                continue
+            if k == "url":
+                clean_row[k] = url
+                continue
             val = r.get(k, "")
             # Preserve newlines for content/abstract/title, but sanitize others
             if k in ("content", "abstract", "title"):
                 clean_row[k] = sanitize_text(val, one_line=False)
+            elif k in _LABEL_FIELDS and isinstance(val, str):
+                clean_row[k] = _sanitize_label(val)
             else:
                 clean_row[k] = sanitize_text(val, one_line=True)
-        
-        uid = clean_row.get("uid", "")
-        url = clean_row.get("url", "")
 
-        # Dedupe check
-        if dedupe_by == "uid" and uid and uid in existing_uids:
-            continue
-        if dedupe_by == "url" and url and url in existing_urls:
-            continue
-        
         filtered.append(clean_row)
         if uid:
             existing_uids.add(uid)
@@ -225,12 +364,11 @@ def write_incremental_csv(
         if new_mode == "a" and new_csv.exists():
             shutil.copy2(new_csv, temp_new_csv)
         
-        with temp_new_csv.open(new_mode, encoding="utf-8-sig", newline="") as f:
+        with temp_new_csv.open(new_mode, encoding="utf-8-sig", newline="", buffering=CSV_WRITE_BUFFER) as f:
             writer = csv.DictWriter(f, fieldnames=list(fields), quoting=csv.QUOTE_ALL, extrasaction="ignore")
             if new_need_header:
                 writer.writeheader()
-            for r in filtered:
-                writer.writerow(r)
+            writer.writerows(filtered)
         
         # Atomic replace
         temp_new_csv.replace(new_csv)
@@ -265,12 +403,11 @@ def write_incremental_csv(
         if not need_header and all_csv.exists():
             shutil.copy2(all_csv, temp_all_csv)
         
-        with temp_all_csv.open("a" if not need_header else "w", encoding="utf-8-sig", newline="") as f:
+        with temp_all_csv.open("a" if not need_header else "w", encoding="utf-8-sig", newline="", buffering=CSV_WRITE_BUFFER) as f:
             writer = csv.DictWriter(f, fieldnames=list(fields), quoting=csv.QUOTE_ALL, extrasaction="ignore")
             if need_header:
                 writer.writeheader()
-            for r in filtered:
-                writer.writerow(r)
+            writer.writerows(filtered)
         
         # Atomic replace
         temp_all_csv.replace(all_csv)
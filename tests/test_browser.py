@@ -0,0 +1,106 @@
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.scrapers._browser import DetailPagePool
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        page = FakePage()
+        self.pages.append(page)
+        return page
+
+class TestDetailPagePool(unittest.TestCase):
+    def test_results_in_link_order(self):
+        async def fetch(page, link):
+            # Later links finish first
+            await asyncio.sleep(0.001 * (5 - link))
+            return f"text-{link}"
+
+        pool = DetailPagePool(FakeContext(), size=3)
+        result = asyncio.run(pool.fetch_all(fetch, list(range(5))))
+        self.assertEqual(result, [f"text-{i}" for i in range(5)])
+
+    def test_slot_limit(self):
+        context = FakeContext()
+        in_flight = 0
+        peak = 0
+
+        async def fetch(page, link):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            return link
+
+        pool = DetailPagePool(context, size=2)
+        asyncio.run(pool.fetch_all(fetch, list(range(8))))
+        self.assertEqual(peak, 2)
+        self.assertEqual(len(context.pages), 2)
+
+    def test_closed_page_is_replaced(self):
+        # A page closed mid-fetch must not strand the fetches waiting for a slot
+        context = FakeContext()
+
+        async def fetch(page, link):
+            await asyncio.sleep(0.001)
+            if link == 0:
+                page.closed = True
+            return link
+
+        pool = DetailPagePool(context, size=1)
+        result = asyncio.run(asyncio.wait_for(pool.fetch_all(fetch, [0, 1, 2]), timeout=2))
+        self.assertEqual(result, [0, 1, 2])
+        self.assertEqual(len(context.pages), 2)
+
+    def test_failed_new_page_returns_slot(self):
+        class FlakyContext(FakeContext):
+            async def new_page(self):
+                if not self.pages:
+                    self.pages.append(None)
+                    raise RuntimeError("target closed")
+                return await super().new_page()
+
+        async def fetch(page, link):
+            return link
+
+        async def run():
+            pool = DetailPagePool(FlakyContext(), size=1)
+            with self.assertRaises(RuntimeError):
+                await pool.fetch_all(fetch, [0])
+            return await asyncio.wait_for(pool.fetch_all(fetch, [1, 2]), timeout=2)
+
+        self.assertEqual(asyncio.run(run()), [1, 2])
+
+    def test_static_hit_skips_page(self):
+        context = FakeContext()
+
+        async def fetch_static(link):
+            return "static" if link % 2 == 0 else ""
+
+        async def fetch(page, link):
+            return "page"
+
+        pool = DetailPagePool(context, size=4)
+        result = asyncio.run(pool.fetch_all(fetch, [0, 1, 2, 3], fetch_static=fetch_static))
+        self.assertEqual(result, ["static", "page", "static", "page"])
+        self.assertLessEqual(len(context.pages), 2)
+
+if __name__ == '__main__':
+    unittest.main()
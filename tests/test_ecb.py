@@ -0,0 +1,241 @@
+import csv
+import random
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from bs4 import BeautifulSoup
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.scrapers import ecb
+
+def old_missing_content_urls(csv_path):
+    """The DictReader scan load_history_urls replaced (URLs of rows with empty content)."""
+    missing = set()
+    with csv_path.open("r", encoding="utf-8-sig", newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames:
+            for row in reader:
+                u = (row.get("url") or "").strip()
+                if u and not row.get("content"):
+                    missing.add(u)
+    return missing
+
+def old_extract_ecb_content(html):
+    """The per-candidate serialize/re-parse/clean extract_ecb_content replaced."""
+    soup = BeautifulSoup(html, "lxml")
+
+    def _clean_container(container_html):
+        sub = BeautifulSoup(container_html, "lxml")
+        for sel in ecb.ECB_UNWANTED:
+            for t in sub.select(sel):
+                t.decompose()
+        texts = []
+        for el in sub.select("h1,h2,h3,h4,p,li"):
+            txt = el.get_text(" ", strip=True)
+            if not txt:
+                continue
+            if el.name == "li" or len(txt) >= 20:
+                texts.append(txt)
+        return "\n\n".join(texts).strip()
+
+    candidates = []
+    main = soup.find("main")
+    if main is not None:
+        candidates.append(main)
+        candidates.extend(main.select("div.section"))
+    candidates.extend(soup.select("div.section"))
+    if not candidates:
+        if soup.body is None:
+            return ""
+        candidates = [soup.body]
+
+    best = ""
+    for c in candidates:
+        text = _clean_container(str(c))
+        if len(text) > len(best):
+            best = text
+    return best
+
+LONG = "This paragraph is long enough to be kept as article text."
+
+class TestExtractEcbContent(unittest.TestCase):
+    def _same_as_old(self, html):
+        new = ecb.extract_ecb_content(html)
+        self.assertEqual(new, old_extract_ecb_content(html))
+        return new
+
+    def test_press_release(self):
+        html = f"""<html><body>
+            <header><p>{LONG} header</p></header>
+            <nav><ul><li>Home</li></ul></nav>
+            <main>
+              <div class="ecb-breadcrumbscontainer"><p>{LONG} crumbs</p></div>
+              <h1>Press release title on the digital euro</h1>
+              <div class="section"><p>{LONG} one<sup>1</sup></p><ul><li>item</li></ul>
+                <div class="ecb-social-sharing"><p>{LONG} share</p></div></div>
+              <div class="section"><p>{LONG} two</p><p>short</p></div>
+              <div class="address-box"><p>{LONG} address</p></div>
+            </main>
+            <footer><p>{LONG} footer</p></footer>
+        </body></html>"""
+        text = self._same_as_old(html)
+        self.assertIn("Press release title on the digital euro", text)
+        self.assertIn(f"{LONG} two", text)
+        self.assertNotIn("share", text)
+        self.assertNotIn("crumbs", text)
+        self.assertNotIn("short", text)
+
+    def test_sections_without_main(self):
+        html = f"""<html><body>
+            <div class="section"><p>{LONG} a</p></div>
+            <div class="section"><p>{LONG} b</p><p>{LONG} c</p><div id="feedback"><p>{LONG} x</p></div></div>
+        </body></html>"""
+        self.assertEqual(self._same_as_old(html), f"{LONG} b\n\n{LONG} c")
+
+    def test_body_fallback_and_empty(self):
+        html = f"<html><body><aside><p>{LONG}</p></aside><p>{LONG} body</p></body></html>"
+        self.assertEqual(self._same_as_old(html), f"{LONG} body")
+        self.assertEqual(self._same_as_old(""), "")
+
+    def test_candidate_that_is_boilerplate(self):
+        html = f"""<html><body><main><p>{LONG} main</p>
+            <div class="section info-box"><p>{LONG} info</p><p>{LONG} info 2</p></div>
+        </main></body></html>"""
+        self.assertEqual(self._same_as_old(html), f"{LONG} main")
+
+    def test_section_inside_boilerplate(self):
+        # The one case that changed: a div.section nested in removed boilerplate was still
+        # a candidate of its own (it was cleaned on a re-parse of just that section);
+        # with the page cleaned in place it is gone with its ancestor
+        html = f"""<html><body>
+            <main><p>{LONG} main</p></main>
+            <aside><div class="section"><p>{LONG} side 1</p><p>{LONG} side 2</p></div></aside>
+        </body></html>"""
+        self.assertEqual(old_extract_ecb_content(html), f"{LONG} side 1\n\n{LONG} side 2")
+        self.assertEqual(ecb.extract_ecb_content(html), f"{LONG} main")
+
+    def test_randomized_against_old(self):
+        # Random pages with no div.section inside boilerplate
+        rng = random.Random(7)
+        boiler = ["header", "footer", "nav", "aside", "div class='info-box'", "div id='cookieConsent'"]
+
+        def leaf(i):
+            tag = rng.choice(["p", "li", "h2", "p"])
+            text = LONG if rng.random() < 0.6 else "tiny"
+            if rng.random() < 0.2:
+                return f"<p>{text} {i}<sup>{i}</sup></p>"
+            return f"<{tag}>{text} {i}</{tag}>"
+
+        def block(depth, i):
+            parts = [leaf(f"{i}.{k}") for k in range(rng.randint(0, 3))]
+            if rng.random() < 0.3:
+                b = rng.choice(boiler)
+                parts.append(f"<{b}>{leaf(f'{i}.b')}</{b.split()[0]}>")
+            if depth < 2:
+                for k in range(rng.randint(0, 2)):
+                    parts.append(f"<div class='section'>{block(depth + 1, f'{i}.{k}')}</div>")
+            rng.shuffle(parts)
+            return "".join(parts)
+
+        for n in range(300):
+            inner = block(0, n)
+            html = f"<html><body>{inner if rng.random() < 0.3 else f'<main>{inner}</main>'}</body></html>"
+            with self.subTest(n=n):
+                self._same_as_old(html)
+
+class TestLoadHistoryUrls(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.path = self.tmp / "all.csv"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, rows):
+        with self.path.open("w", encoding="utf-8-sig", newline="") as f:
+            csv.writer(f).writerows(rows)
+
+    def _check_against_old(self, rows):
+        self._write(rows)
+        with patch.object(ecb, "BACKFILL_EMPTY_CONTENT", 1):
+            _, missing = ecb.load_history_urls(self.path)
+        expected = {ecb.url_key(u) for u in old_missing_content_urls(self.path)}
+        self.assertEqual(missing, expected)
+        return missing
+
+    def test_short_and_long_rows(self):
+        missing = self._check_against_old([
+            ["uid", "url", "title", "content"],
+            ["1", "https://ecb.europa.eu/a", "A", "text"],
+            ["2", "https://ecb.europa.eu/b", "B", ""],
+            # Short rows: no content cell, or not even a url cell
+            ["3", "https://ecb.europa.eu/c"],
+            ["4"],
+            # Extra fields past the header
+            ["5", "https://ecb.europa.eu/d", "D", "", "extra", "more"],
+            ["6", "  ", "blank url", ""],
+        ])
+        self.assertEqual(missing, {
+            "https://ecb.europa.eu/b", "https://ecb.europa.eu/c", "https://ecb.europa.eu/d",
+        })
+
+    def test_no_content_column(self):
+        missing = self._check_against_old([
+            ["uid", "url"],
+            ["1", "https://ecb.europa.eu/a"],
+            ["2", "https://ecb.europa.eu/b/"],
+        ])
+        self.assertEqual(missing, {"https://ecb.europa.eu/a", "https://ecb.europa.eu/b"})
+
+    def test_no_url_column(self):
+        self._write([["uid", "content"], ["1", ""]])
+        self.assertEqual(ecb.load_history_urls(self.path), (frozenset(), frozenset()))
+        self.assertEqual(old_missing_content_urls(self.path), set())
+
+    def test_empty_and_absent_file(self):
+        self.path.write_text("", encoding="utf-8")
+        self.assertEqual(ecb.load_history_urls(self.path), (frozenset(), frozenset()))
+        self.assertEqual(ecb.load_history_urls(self.tmp / "absent.csv"), (frozenset(), frozenset()))
+
+    def test_known_urls_and_backfill_off(self):
+        self._write([
+            ["url", "content"],
+            ["https://ECB.europa.eu/A/", "text"],
+            ["https://ecb.europa.eu/b", ""],
+        ])
+        with patch.object(ecb, "BACKFILL_EMPTY_CONTENT", 0):
+            existing, missing = ecb.load_history_urls(self.path)
+        self.assertEqual(existing, {"https://ecb.europa.eu/a", "https://ecb.europa.eu/b"})
+        self.assertEqual(missing, frozenset())
+
+    def test_randomized_against_old(self):
+        rng = random.Random(20240305)
+        columns = ["uid", "url", "title", "content", "source"]
+        for _ in range(200):
+            header = rng.sample(columns, rng.randint(1, len(columns)))
+            rows = [header]
+            for i in range(rng.randint(0, 12)):
+                row = []
+                for col in header:
+                    if col == "url":
+                        row.append(rng.choice(["", " ", f"https://ecb.europa.eu/p{i % 5}", f" https://ecb.europa.eu/q{i} "]))
+                    elif col == "content":
+                        row.append(rng.choice(["", "body text"]))
+                    else:
+                        row.append(f"{col}{i}")
+                # Drop or add trailing cells
+                cut = rng.randint(0, len(row) + 2)
+                row = row[:cut] if cut <= len(row) else row + ["x"] * (cut - len(row))
+                rows.append(row)
+            with self.subTest(header=header, rows=len(rows)):
+                self._check_against_old(rows)
+
+if __name__ == '__main__':
+    unittest.main()
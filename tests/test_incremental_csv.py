@@ -0,0 +1,145 @@
+import csv
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src import utils
+from src.utils import STANDARD_FIELDS, load_existing_keys, load_seen_uids, write_incremental_csv
+
+class TestIncrementalCsv(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.all_csv = self.tmp / "all.csv"
+        self.new_csv = self.tmp / "new.csv"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _row(self, uid, url=None, **extra):
+        row = {"uid": uid, "url": url or f"https://example.org/{uid}", "title": f"Title {uid}"}
+        row.update(extra)
+        return row
+
+    def _write(self, rows, **kwargs):
+        return write_incremental_csv(all_csv=self.all_csv, new_csv=self.new_csv, rows=rows, **kwargs)
+
+    def _read(self, path):
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            return list(csv.DictReader(f))
+
+    def test_generator_rows(self):
+        consumed = []
+
+        def rows():
+            for uid in ["a", "b"]:
+                consumed.append(uid)
+                yield self._row(uid)
+
+        self.assertEqual(self._write(rows()), 2)
+        self.assertEqual(consumed, ["a", "b"])
+        all_rows = self._read(self.all_csv)
+        self.assertEqual([r["uid"] for r in all_rows], ["a", "b"])
+        self.assertEqual(list(all_rows[0].keys()), list(STANDARD_FIELDS))
+        self.assertEqual(all_rows[1]["title"], "Title b")
+
+    def test_empty_iterable(self):
+        self.assertEqual(self._write(iter([])), 0)
+        self.assertFalse(self.all_csv.exists())
+
+    def test_new_csv_overwrite_and_append(self):
+        self._write(iter([self._row("a")]))
+        self._write(iter([self._row("b")]))
+        # Overwritten each run by default
+        self.assertEqual([r["uid"] for r in self._read(self.new_csv)], ["b"])
+
+        self._write(iter([self._row("c")]), append_new=True)
+        self.assertEqual([r["uid"] for r in self._read(self.new_csv)], ["b", "c"])
+        self.assertEqual([r["uid"] for r in self._read(self.all_csv)], ["a", "b", "c"])
+
+    def test_dedupe_against_history_and_batch(self):
+        self._write([self._row("a"), self._row("b")])
+        # "b" is in the history and "c" repeats within the batch; keys are compared sanitized
+        added = self._write([self._row(" b "), self._row("c"), self._row("c\u200b"), self._row("d")])
+        self.assertEqual(added, 2)
+        self.assertEqual([r["uid"] for r in self._read(self.all_csv)], ["a", "b", "c", "d"])
+        self.assertEqual([r["uid"] for r in self._read(self.new_csv)], ["c", "d"])
+
+    def test_dedupe_by_url(self):
+        self._write([self._row("a", url="https://example.org/x")], dedupe_by="url")
+        added = self._write(
+            [self._row("b", url="https://example.org/x"), self._row("c", url="https://example.org/y")],
+            dedupe_by="url",
+        )
+        self.assertEqual(added, 1)
+        self.assertEqual([r["uid"] for r in self._read(self.new_csv)], ["c"])
+
+    def test_kept_rows_sanitized(self):
+        self._write([self._row("a", source=" rss\n", content="line one\r\n\r\n\r\nline two", abstract=None)])
+        row = self._read(self.all_csv)[0]
+        self.assertEqual(row["source"], "rss")
+        self.assertEqual(row["abstract"], "")
+        self.assertNotIn("\r", row["content"])
+        self.assertTrue(row["content"].startswith("line one\n"))
+
+    def test_dropped_rows_not_sanitized(self):
+        self._write([self._row("a")])
+        with patch.object(utils, "sanitize_text", wraps=utils.sanitize_text) as sanitize:
+            self._write([self._row("a", content="DROPPED BODY"), self._row("b", content="KEPT BODY")])
+        values = [c.args[0] for c in sanitize.call_args_list]
+        self.assertNotIn("DROPPED BODY", values)
+        self.assertIn("KEPT BODY", values)
+
+class TestHistoryKeys(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.all_csv = self.tmp / "all.csv"
+        self.new_csv = self.tmp / "new.csv"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _write(self, *uids):
+        rows = [{"uid": u, "url": f"https://example.org/{u}"} for u in uids]
+        write_incremental_csv(all_csv=self.all_csv, new_csv=self.new_csv, rows=rows)
+
+    def test_cached_until_the_file_changes(self):
+        self._write("a")
+        first = load_seen_uids(self.all_csv)
+        self.assertEqual(first, {"a"})
+        # Unchanged file: served from the cache
+        self.assertIs(load_seen_uids(self.all_csv), first)
+
+        self._write("b")
+        self.assertEqual(load_seen_uids(self.all_csv), {"a", "b"})
+
+    def test_rewrite_outside_write_incremental_csv(self):
+        # Any change in size invalidates the entry, e.g. the processor's history write-back
+        self._write("a")
+        load_seen_uids(self.all_csv)
+        with self.all_csv.open("a", encoding="utf-8", newline="") as f:
+            row = {"uid": "z", "url": "https://example.org/z"}
+            csv.writer(f).writerow([row.get(k, "") for k in STANDARD_FIELDS])
+        self.assertEqual(load_seen_uids(self.all_csv), {"a", "z"})
+
+    def test_existing_keys_are_copies(self):
+        self._write("a")
+        uids, urls = load_existing_keys(self.all_csv)
+        uids.add("z")
+        urls.add("https://example.org/z")
+        self.assertEqual(load_seen_uids(self.all_csv), {"a"})
+        self.assertEqual(load_existing_keys(self.all_csv), ({"a"}, {"https://example.org/a"}))
+
+    def test_missing_or_empty_history(self):
+        self.assertEqual(load_seen_uids(self.tmp / "absent.csv"), frozenset())
+        self.all_csv.write_text("", encoding="utf-8")
+        self.assertEqual(load_existing_keys(self.all_csv), (set(), set()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,14 +3,21 @@ import unittest
 from unittest.mock import MagicMock, patch
 import sys
 import os
+import shutil
+import tempfile
+from datetime import datetime
 from pathlib import Path
 
+import pandas as pd
+
 # Add project root to path
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
-from src.utils import to_chinese_numeral
+from src.utils import EN_MONTHS, parse_day_month_year, to_chinese_numeral
 from src.services.relevance_service import RelevanceService
+from src import processor
+from src.pipeline.post_process import TEMPLATE_MARKERS, find_missing_markers
 
 class TestUtils(unittest.TestCase):
     def test_to_chinese_numeral(self):
@@ -23,6 +30,21 @@ class TestUtils(unittest.TestCase):
         # Test fallback
         self.assertEqual(to_chinese_numeral(100), "100")
 
+    def test_parse_day_month_year(self):
+        self.assertEqual(parse_day_month_year("5 March 2024"), datetime(2024, 3, 5))
+        self.assertEqual(parse_day_month_year("Published 05 Sept. 2023, Paris"), datetime(2023, 9, 5))
+        self.assertEqual(parse_day_month_year("12 jan 2025"), datetime(2025, 1, 12))
+        # Invalid day, non-English month, nothing to parse
+        self.assertIsNone(parse_day_month_year("31 February 2024"))
+        self.assertIsNone(parse_day_month_year("5 Marzo 2024"))
+        self.assertIsNone(parse_day_month_year(""))
+        self.assertIsNone(parse_day_month_year(None))
+
+    def test_en_months(self):
+        self.assertEqual(EN_MONTHS["may"], 5)
+        self.assertEqual(EN_MONTHS["sept"], EN_MONTHS["september"])
+        self.assertEqual(sorted(set(EN_MONTHS.values())), list(range(1, 13)))
+
 class TestRelevanceService(unittest.TestCase):
     def setUp(self):
         self.service = RelevanceService()
@@ -89,5 +111,96 @@ class TestRelevanceService(unittest.TestCase):
         self.assertEqual(result['is_relevant'], "ERROR")
         self.assertTrue(result['alert_needed'])
 
+class TestTemplateMarkers(unittest.TestCase):
+    def test_all_present(self):
+        paragraphs = ["header"] + list(TEMPLATE_MARKERS) + ["footer"]
+        self.assertEqual(find_missing_markers(paragraphs), [])
+
+    def test_marker_inside_paragraph(self):
+        paragraphs = [f"xx {m} yy" for m in TEMPLATE_MARKERS]
+        self.assertEqual(find_missing_markers(paragraphs), [])
+
+    def test_missing(self):
+        self.assertEqual(find_missing_markers([]), list(TEMPLATE_MARKERS))
+        self.assertEqual(find_missing_markers([TEMPLATE_MARKERS[0]]), list(TEMPLATE_MARKERS[1:]))
+
+    def test_marker_split_across_paragraphs(self):
+        marker = TEMPLATE_MARKERS[0]
+        paragraphs = [marker[:2], marker[2:]] + list(TEMPLATE_MARKERS[1:])
+        self.assertEqual(find_missing_markers(paragraphs), [marker])
+
+class TestUpdateGlobalHistory(unittest.TestCase):
+    HISTORY = (
+        "uid,title,is_relevant,zai_is_relevant,zai_reason,or_is_relevant,or_reason\n"
+        "u1,One,,,,,\n"
+        "u2,Two,TRUE,TRUE,kept,FALSE,kept\n"
+        "u3,Three,FALSE,FALSE,old,FALSE,old\n"
+        "u3,Three again,FALSE,FALSE,old,FALSE,old\n"
+        "u4,Four,,,,,\n"
+    )
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.history = self.tmp / "all.csv"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _run_df(self):
+        # As processor.main() has it: statuses of this run, read back from the new CSV
+        return pd.DataFrame({
+            "uid": ["u1", "u3", "u3", "u2", "missing"],
+            "title": ["One", "Three", "Three", "Two", "Not in history"],
+            # u3 twice: the last row wins; u2 has empty cells, which keep the history values
+            "is_relevant": [True, False, True, None, True],
+            "zai_is_relevant": [True, False, True, None, True],
+            "zai_reason": ["r1", "first", "second", None, "x"],
+            "or_is_relevant": ["ERROR", False, False, None, False],
+            "or_reason": ["", "first", "second", None, "x"],
+        })
+
+    def _old_loop(self, df):
+        """The per-column map/fillna write-back update_global_history replaced (history read as text)."""
+        df_all = pd.read_csv(self.history, dtype=str)
+        for col in processor.STATUS_COLUMNS:
+            status_map = dict(zip(df["uid"], df[col]))
+            df_all[col] = df_all["uid"].map(status_map).fillna(df_all[col])
+        df_all.to_csv(self.history, index=False, encoding="utf-8-sig")
+        return self.history.read_bytes()
+
+    def _new(self, df):
+        with patch.object(processor, "GLOBAL_ALL_CSV", self.history):
+            processor.update_global_history(df)
+        return self.history.read_bytes()
+
+    def test_same_file_as_per_column_loop(self):
+        self.history.write_text(self.HISTORY, encoding="utf-8")
+        expected = self._old_loop(self._run_df())
+        self.history.write_text(self.HISTORY, encoding="utf-8")
+        self.assertEqual(self._new(self._run_df()), expected)
+
+    def test_written_values(self):
+        self.history.write_text(self.HISTORY, encoding="utf-8")
+        self._new(self._run_df())
+        rows = pd.read_csv(self.history, dtype=str, keep_default_na=False)
+        by_uid = rows.groupby("uid")
+        self.assertEqual(list(rows["uid"]), ["u1", "u2", "u3", "u3", "u4"])
+        self.assertEqual(by_uid.get_group("u1")["zai_reason"].tolist(), ["r1"])
+        # Empty cells in this run leave the history as it was
+        self.assertEqual(by_uid.get_group("u2")["zai_reason"].tolist(), ["kept"])
+        self.assertEqual(by_uid.get_group("u2")["is_relevant"].tolist(), ["TRUE"])
+        # Duplicate uids: the last run row is applied to every history row with that uid
+        self.assertEqual(by_uid.get_group("u3")["zai_reason"].tolist(), ["second", "second"])
+        self.assertEqual(by_uid.get_group("u3")["title"].tolist(), ["Three", "Three again"])
+        # Untouched rows keep their text as written
+        self.assertEqual(by_uid.get_group("u4")["is_relevant"].tolist(), [""])
+
+    def test_history_without_status_columns(self):
+        self.history.write_text("uid,title\nu1,One\n", encoding="utf-8")
+        self._new(self._run_df())
+        rows = pd.read_csv(self.history, dtype=str, keep_default_na=False)
+        self.assertEqual(list(rows.columns), ["uid", "title"] + processor.STATUS_COLUMNS)
+        self.assertEqual(rows.loc[0, "zai_reason"], "r1")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,49 @@
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+from dateutil import parser as dateutil_parser
+
+# Add project root to path
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from src.scrapers.rss import _FEED_DATE_FORMATS, safe_parse_date
+
+class TestSafeParseDate(unittest.TestCase):
+    # One sample per entry of _FEED_DATE_FORMATS, in order
+    TABLE_SAMPLES = [
+        "Tue, 05 Mar 2024 14:00:00 -0500",
+        "Tue, 05 Mar 2024 14:00:00 GMT",
+        "2024-03-05T14:00:00+02:00",
+        "2024-03-05 14:00:00",
+    ]
+
+    def test_table_matches_dateutil(self):
+        samples = self.TABLE_SAMPLES + ["Tue, 05 Mar 2024 14:00:00 +0000", "2024-03-05T14:00:00Z"]
+        for raw in samples:
+            with self.subTest(raw=raw):
+                expected = dateutil_parser.parse(raw).strftime("%Y-%m-%d %H:%M:%S")
+                self.assertEqual(safe_parse_date(raw), expected)
+
+    def test_samples_hit_the_table(self):
+        # Each sample parses with its own format, so the test above covers the strptime path
+        self.assertEqual(len(self.TABLE_SAMPLES), len(_FEED_DATE_FORMATS))
+        for raw, fmt in zip(self.TABLE_SAMPLES, _FEED_DATE_FORMATS):
+            with self.subTest(raw=raw):
+                datetime.strptime(raw, fmt)
+
+    def test_dateutil_fallback(self):
+        for raw in ["March 5, 2024", "5 March 2024 09:30", " 2024-03-05T14:00:00.123Z "]:
+            with self.subTest(raw=raw):
+                expected = dateutil_parser.parse(raw).strftime("%Y-%m-%d %H:%M:%S")
+                self.assertEqual(safe_parse_date(raw), expected)
+
+    def test_invalid(self):
+        self.assertEqual(safe_parse_date(""), "")
+        self.assertEqual(safe_parse_date(None), "")
+        self.assertEqual(safe_parse_date("not a date"), "")
+
+if __name__ == '__main__':
+    unittest.main()